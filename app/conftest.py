@@ -0,0 +1,22 @@
+# *** imports
+
+# ** infra
+import pytest
+
+# ** app
+from app.utils import pdb as pdb_module
+
+
+# *** fixtures
+
+# ** fixture: pdb_cache_dir
+@pytest.fixture(autouse=True)
+def pdb_cache_dir(tmp_path, monkeypatch) -> str:
+    '''
+    Point the on-disk pattern database cache at a per-test temporary
+    directory, so tests never read or write the user's cache.
+    '''
+
+    # Redirect the cache directory for the duration of the test.
+    monkeypatch.setattr(pdb_module, 'PDB_CACHE_DIR', str(tmp_path))
+    return str(tmp_path)
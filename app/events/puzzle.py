@@ -1,44 +1,75 @@
 # *** imports
 
 # ** core
+import math
 import time
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+# ** infra
+from tiferet.contexts.error import ErrorContext
 
 # ** app
-from .settings import DomainEvent
+from .settings import DomainEvent, TiferetError
 from ..utils import State, Heuristic, AStar
 
 
+# *** constants
+
+# ** constant: heuristic_map
+HEURISTIC_MAP: Dict[str, Callable] = {
+    'misplaced': Heuristic.misplaced,
+    'manhattan': Heuristic.manhattan,
+    'linear-conflict': Heuristic.linear_conflict_code,
+    'pattern-db': Heuristic.pattern_db_code,
+}
+
+# ** constant: max_weight
+MAX_WEIGHT = 1000.0
+
+# ** constant: tile_cost_map
+TILE_COST_MAP: Dict[str, Callable[[List[int]], List[List[int]]]] = {
+    'misplaced': Heuristic.misplaced_table,
+    'manhattan': Heuristic.manhattan_table,
+}
+
+
 # *** events
 
 # ** event: solve_puzzle
 class SolvePuzzle(DomainEvent):
     '''
-    A domain event to solve the 8-puzzle using the A* search algorithm.
-    Supports misplaced, manhattan, linear-conflict, and pattern-db heuristics.
+    A domain event to solve the 8-puzzle using A* or IDA* search (IDA* for
+    unweighted manhattan, linear-conflict, and pattern-db solves, A*
+    otherwise). Supports misplaced, manhattan, linear-conflict, and
+    pattern-db heuristics.
     Delegates state parsing, validation, search, and heuristic computation
     to utility classes in app.utils.
     '''
 
     # * method: execute
     def execute(self,
-            start: str,
-            goal: str = '1,2,3,4,5,6,7,8,*',
+            start: str | Sequence[int],
+            goal: str | Sequence[int] = '1,2,3,4,5,6,7,8,*',
             heuristic: str = 'manhattan',
             blank_symbol: str = '*',
+            weight: float = 1.0,
             **kwargs,
         ) -> str:
         '''
-        Execute the A* search to solve the 8-puzzle.
+        Execute the A* or IDA* search to solve the 8-puzzle. The output
+        names the algorithm used, since their node counts differ in kind:
+        IDA* counts re-expansions across its deepening iterations.
 
-        :param start: The initial state as a string.
-        :type start: str
-        :param goal: The goal state as a string.
-        :type goal: str
+        :param start: The initial state as a string, or a pre-parsed sequence of 9 ints (0 = blank).
+        :type start: str | Sequence[int]
+        :param goal: The goal state as a string, or a pre-parsed sequence of 9 ints (0 = blank).
+        :type goal: str | Sequence[int]
         :param heuristic: The heuristic to use ('misplaced', 'manhattan', 'linear-conflict', or 'pattern-db').
         :type heuristic: str
         :param blank_symbol: The symbol to display for the blank tile.
         :type blank_symbol: str
+        :param weight: The heuristic weight w in f = g + w * h (1.0 to MAX_WEIGHT); values above 1.0 trade optimality (cost at most w times optimal) for fewer expansions.
+        :type weight: float
         :param kwargs: Additional keyword arguments.
         :type kwargs: dict
         :return: A formatted string containing the solution path and metrics.
@@ -46,43 +77,84 @@ class SolvePuzzle(DomainEvent):
         '''
 
         # Validate the heuristic selection.
-        valid_heuristics = ('misplaced', 'manhattan', 'linear-conflict', 'pattern-db')
         self.verify(
-            heuristic in valid_heuristics,
+            heuristic in HEURISTIC_MAP,
             'INVALID_HEURISTIC',
             f'Unsupported heuristic: {heuristic}',
             heuristic=heuristic,
         )
 
-        # Parse and validate the start state.
-        start_state = State.parse_state(start)
+        # Validate the heuristic weight: a number from 1.0 to MAX_WEIGHT
+        # (non-numeric input becomes NaN, which fails the range check).
+        try:
+            weight_value = float(weight)
+        except (TypeError, ValueError):
+            weight_value = math.nan
+        self.verify(
+            1.0 <= weight_value <= MAX_WEIGHT,
+            'INVALID_WEIGHT',
+            f'Heuristic weight must be a number from 1.0 to {MAX_WEIGHT}: {weight}',
+            weight=weight,
+        )
+        weight = weight_value
+
+        # Validate that the start is a string or a pre-parsed sequence before
+        # it is parsed or copied.
+        self.verify(
+            isinstance(start, (str, Sequence)),
+            'INVALID_STATE',
+            f'Invalid puzzle state: {start}',
+            state=str(start),
+        )
+
+        # Parse the start state (a pre-parsed sequence is taken as is) and
+        # validate it.
+        start_state = State.parse_state(start) if isinstance(start, str) else list(start)
         State.verify_state(start_state)
 
-        # Parse and validate the goal state.
-        goal_state = State.parse_state(goal)
-        State.verify_state(goal_state)
+        # Parse and validate the goal state (cached per goal string or
+        # pre-parsed tuple, so repeated solves against one goal skip the work).
+        goal_state = State.parse_goal(goal)
 
         # Check if the puzzle is solvable.
         self.verify(
             State.is_solvable(start_state, goal_state),
             'UNSOLVABLE_STATE',
             'This configuration is unsolvable (mismatched inversion parity).',
-            start=start,
-            goal=goal,
+            start=start if isinstance(start, str) else State.format_state(start_state),
+            goal=goal if isinstance(goal, str) else State.format_state(goal_state),
         )
 
         # Select the heuristic function.
-        heuristic_map = {
-            'misplaced': Heuristic.misplaced,
-            'manhattan': Heuristic.manhattan,
-            'linear-conflict': Heuristic.linear_conflict,
-            'pattern-db': Heuristic.pattern_db,
-        }
-        heuristic_fn = heuristic_map[heuristic]
-
-        # Run A* search.
+        heuristic_fn = HEURISTIC_MAP[heuristic]
+
+        # Use the goal's per-tile cost table for tile-additive heuristics,
+        # letting the search update h incrementally on each move.
+        tile_costs = TILE_COST_MAP[heuristic](goal_state) if heuristic in TILE_COST_MAP else None
+
+        # Route the stronger heuristics to IDA*, which needs no open or closed
+        # set; misplaced tiles is too weak to bound iterative deepening well,
+        # so it keeps A*. Weighted searches also use A*: a weighted f bound
+        # lets IDA* dive far past the optimal depth.
+        if heuristic == 'misplaced' or weight != 1.0:
+            algorithm, search_fn = 'A*', AStar.search
+        else:
+            algorithm, search_fn = 'IDA*', AStar.ida_search
+
+        # Linear conflict and the pattern database are looked up straight
+        # from packed state codes.
+        packed_heuristic = heuristic in ('linear-conflict', 'pattern-db')
+
+        # Run the search.
         start_time = time.perf_counter()
-        path, nodes_expanded = AStar.search(start_state, goal_state, heuristic_fn)
+        path, nodes_expanded = search_fn(
+            start_state,
+            goal_state,
+            heuristic_fn,
+            tile_costs,
+            packed_heuristic,
+            weight,
+        )
         elapsed = time.perf_counter() - start_time
 
         # Format the solution steps as grids.
@@ -95,12 +167,97 @@ class SolvePuzzle(DomainEvent):
         # Build the output string.
         output_lines = [
             f'Heuristic: {heuristic}',
+            f'Algorithm: {algorithm}',
             f'Moves: {len(path) - 1}',
             f'Nodes expanded: {nodes_expanded}',
             f'Time: {elapsed:.4f}s',
             '',
         ]
+        if weight != 1.0:
+            output_lines.insert(2, f'Weight: {weight}')
         output_lines.extend(formatted_steps)
 
         # Return the result as a formatted string.
         return '\n'.join(output_lines)
+
+
+# ** event: solve_puzzle_batch
+class SolvePuzzleBatch(DomainEvent):
+    '''
+    A domain event to solve a batch of 8-puzzle jobs in a single feature
+    run, so the framework dispatch is paid once rather than once per job.
+    Each job is solved by SolvePuzzle; a job that fails with a TiferetError
+    has its error formatted from the configured error definitions and
+    recorded in its place, while unexpected exceptions propagate.
+    '''
+
+    # * attribute: errors
+    errors: ErrorContext
+
+    # * init
+    def __init__(self, errors: ErrorContext = None):
+        '''
+        Initialize the SolvePuzzleBatch event.
+
+        :param errors: The error context used to format job errors from error.yml (optional; without it the error code is used as the message).
+        :type errors: ErrorContext
+        '''
+
+        # Assign the error context.
+        self.errors = errors
+
+    # * method: execute
+    def execute(self,
+            jobs: List[Dict[str, Any]],
+            blank_symbol: str = '*',
+            **kwargs,
+        ) -> List[Dict[str, Any]]:
+        '''
+        Execute SolvePuzzle for each job in order.
+
+        :param jobs: The jobs to solve, each a dict of SolvePuzzle arguments (start, goal, heuristic, ...).
+        :type jobs: List[Dict[str, Any]]
+        :param blank_symbol: The default symbol to display for the blank tile.
+        :type blank_symbol: str
+        :param kwargs: Additional keyword arguments.
+        :type kwargs: dict
+        :return: One dict per job, in job order, with 'success' and either the formatted solution under 'result', or the error code and message under 'error_code' and 'error'.
+        :rtype: List[Dict[str, Any]]
+        '''
+
+        # Share one solver across all jobs.
+        solver = SolvePuzzle()
+
+        # Solve each job, recording a job's domain error in its place so it
+        # does not abort the rest of the batch. Any other exception is a bug
+        # and propagates.
+        results = []
+        for job in jobs:
+            try:
+                result = solver.execute(**{'blank_symbol': blank_symbol, **job})
+            except TiferetError as e:
+                error_code, error = self.format_error(e)
+                results.append(dict(success=False, result=None, error_code=error_code, error=error))
+            else:
+                results.append(dict(success=True, result=result, error_code=None, error=None))
+
+        # Return the results in job order.
+        return results
+
+    # * method: format_error
+    def format_error(self, error: TiferetError) -> Tuple[str, str]:
+        '''
+        Format a job's error as an error code and message.
+
+        :param error: The error raised by the job.
+        :type error: TiferetError
+        :return: A tuple of (error code, error message).
+        :rtype: Tuple[str, str]
+        '''
+
+        # Format the message from the configured error definitions.
+        if self.errors:
+            return error.error_code, self.errors.handle_error(error).get('message')
+
+        # Otherwise use the error code as the message.
+        return error.error_code, error.error_code
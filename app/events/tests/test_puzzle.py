@@ -4,9 +4,12 @@
 import pytest
 from tiferet.events import DomainEvent
 from tiferet.assets.exceptions import TiferetError
+from tiferet.commands.error import GetError
+from tiferet.contexts.error import ErrorContext
+from tiferet.repos.config.error import ErrorConfigurationRepository
 
 # ** app
-from app.events.puzzle import SolvePuzzle
+from app.events.puzzle import SolvePuzzle, SolvePuzzleBatch
 
 
 # *** constants
@@ -42,6 +45,7 @@ def test_solve_puzzle_manhattan():
 
     # Verify the output contains expected markers.
     assert 'Heuristic: manhattan' in result
+    assert 'Algorithm: IDA*' in result
     assert 'Moves: 1' in result
 
 
@@ -61,6 +65,7 @@ def test_solve_puzzle_misplaced():
 
     # Verify the output contains expected markers.
     assert 'Heuristic: misplaced' in result
+    assert 'Algorithm: A*' in result
     assert 'Moves: 1' in result
 
 
@@ -195,3 +200,238 @@ def test_solve_puzzle_unsolvable():
 
     # Verify the error code.
     assert exc_info.value.error_code == 'UNSOLVABLE_STATE'
+
+
+# ** test: test_solve_puzzle_weighted
+def test_solve_puzzle_weighted():
+    '''
+    Test solving a scrambled puzzle with a heuristic weight above 1.0.
+    '''
+
+    # Execute the solve puzzle event with a weighted heuristic.
+    result = DomainEvent.handle(
+        SolvePuzzle,
+        start=SCRAMBLED_START,
+        goal=GOAL_STRING,
+        heuristic='misplaced',
+        weight=1.5,
+    )
+
+    # Verify the weight is reported alongside the solution.
+    assert 'Algorithm: A*\nWeight: 1.5' in result
+    assert 'Step 0:' in result
+
+
+# ** test: test_solve_puzzle_weighted_bound
+def test_solve_puzzle_weighted_bound():
+    '''
+    Test that weighted solves stay within w times the optimal path length
+    for every heuristic, including large weights.
+    '''
+
+    # Read the move count from a solve result.
+    moves = lambda result: int(result.split('Moves: ')[1].split('\n')[0])
+
+    # Solve a 31-move configuration optimally, then with each weight.
+    start = '8,6,7,2,5,4,3,*,1'
+    optimal = moves(DomainEvent.handle(SolvePuzzle, start=start, goal=GOAL_STRING, heuristic='pattern-db'))
+    for heuristic in ('misplaced', 'manhattan', 'linear-conflict', 'pattern-db'):
+        for weight in (1.5, 3.0, 100.0, 1000.0):
+            result = DomainEvent.handle(
+                SolvePuzzle,
+                start=start,
+                goal=GOAL_STRING,
+                heuristic=heuristic,
+                weight=weight,
+            )
+
+            # Verify the path cost bound.
+            assert optimal <= moves(result) <= weight * optimal
+
+
+# ** test: test_solve_puzzle_invalid_weight
+def test_solve_puzzle_invalid_weight():
+    '''
+    Test that a weight below 1.0, above MAX_WEIGHT, non-finite, or
+    non-numeric raises INVALID_WEIGHT.
+    '''
+
+    # Execute with each invalid weight and expect a TiferetError.
+    for weight in (0.5, 1001.0, float('inf'), float('nan'), 'abc', None):
+        with pytest.raises(TiferetError) as exc_info:
+            DomainEvent.handle(
+                SolvePuzzle,
+                start=SOLVABLE_START,
+                goal=GOAL_STRING,
+                heuristic='manhattan',
+                weight=weight,
+            )
+
+        # Verify the error code.
+        assert exc_info.value.error_code == 'INVALID_WEIGHT'
+
+
+# ** test: test_solve_puzzle_pre_parsed
+def test_solve_puzzle_pre_parsed():
+    '''
+    Test that pre-parsed start and goal tuples solve the same as strings.
+    '''
+
+    # Execute the solve puzzle event with strings and with tuples.
+    from_strings = DomainEvent.handle(
+        SolvePuzzle,
+        start=SCRAMBLED_START,
+        goal=GOAL_STRING,
+        heuristic='linear-conflict',
+    )
+    from_tuples = DomainEvent.handle(
+        SolvePuzzle,
+        start=(4, 1, 2, 7, 6, 3, 0, 5, 8),
+        goal=(1, 2, 3, 4, 5, 6, 7, 8, 0),
+        heuristic='linear-conflict',
+    )
+
+    # Verify both produce the same solution, ignoring the timing line.
+    strip_time = lambda result: [line for line in result.split('\n') if not line.startswith('Time:')]
+    assert strip_time(from_tuples) == strip_time(from_strings)
+
+
+# ** test: test_solve_puzzle_pre_parsed_invalid
+def test_solve_puzzle_pre_parsed_invalid():
+    '''
+    Test that a pre-parsed start or goal is still validated, tile types included.
+    '''
+
+    # Execute with a duplicate tile, string tiles, and float tiles, and
+    # expect a TiferetError for each.
+    for start in (
+        (1, 1, 3, 4, 5, 6, 7, 8, 0),
+        ('1', '2', '3', '4', '5', '6', '7', '8', '0'),
+        (1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 0.0, 8.0),
+    ):
+        with pytest.raises(TiferetError) as exc_info:
+            DomainEvent.handle(
+                SolvePuzzle,
+                start=start,
+                goal=GOAL_STRING,
+            )
+
+        # Verify the error code.
+        assert exc_info.value.error_code == 'INVALID_STATE'
+
+    # Execute with non-sequence starts and goals and expect INVALID_STATE.
+    for start, goal in ((None, GOAL_STRING), (5, GOAL_STRING), (GOAL_STRING, None), (GOAL_STRING, 5)):
+        with pytest.raises(TiferetError) as exc_info:
+            DomainEvent.handle(
+                SolvePuzzle,
+                start=start,
+                goal=goal,
+            )
+
+        # Verify the error code.
+        assert exc_info.value.error_code == 'INVALID_STATE'
+
+    # Execute with a pre-parsed float goal and expect INVALID_STATE.
+    with pytest.raises(TiferetError) as exc_info:
+        DomainEvent.handle(
+            SolvePuzzle,
+            start=GOAL_STRING,
+            goal=(1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 0.0),
+        )
+
+    # Verify the error code.
+    assert exc_info.value.error_code == 'INVALID_STATE'
+
+
+# ** test: test_solve_puzzle_batch
+def test_solve_puzzle_batch():
+    '''
+    Test that a batch solves each job in order and records a failed job's
+    configured error message without aborting the rest of the batch.
+    '''
+
+    # Build the error context over the app's error configuration.
+    errors = ErrorContext(GetError(ErrorConfigurationRepository('app/configs/error.yml')))
+
+    # Execute a batch with solvable, unsolvable, and invalid jobs.
+    results = DomainEvent.handle(
+        SolvePuzzleBatch,
+        dependencies=dict(errors=errors),
+        jobs=[
+            dict(start=SOLVABLE_START, goal=GOAL_STRING, heuristic='manhattan'),
+            dict(start=UNSOLVABLE_START, goal=GOAL_STRING, heuristic='manhattan'),
+            dict(start='1,1,3,4,5,6,7,8,*', goal=GOAL_STRING),
+            dict(start=SOLVABLE_START, goal=GOAL_STRING, heuristic='unknown'),
+            dict(start=SCRAMBLED_START, goal=GOAL_STRING, heuristic='pattern-db'),
+        ],
+    )
+
+    # Verify one result per job, in job order.
+    assert [result['success'] for result in results] == [True, False, False, False, True]
+    assert 'Heuristic: manhattan' in results[0]['result']
+    assert 'Moves: 1' in results[0]['result']
+    assert 'Heuristic: pattern-db' in results[4]['result']
+    assert results[4]['error_code'] is None
+    assert results[4]['error'] is None
+
+    # Verify each failure's code and configured message.
+    assert results[1]['result'] is None
+    assert results[1]['error_code'] == 'UNSOLVABLE_STATE'
+    assert results[1]['error'] == f'The puzzle configuration is unsolvable: {UNSOLVABLE_START} to {GOAL_STRING}'
+    assert results[2]['error_code'] == 'INVALID_STATE'
+    assert results[2]['error'] == 'Invalid puzzle state: [1, 1, 3, 4, 5, 6, 7, 8, 0]'
+    assert results[3]['error_code'] == 'INVALID_HEURISTIC'
+    assert results[3]['error'] == "Unsupported heuristic: unknown. Use 'misplaced', 'manhattan', 'linear-conflict', or 'pattern-db'."
+
+
+# ** test: test_solve_puzzle_batch_error_messages
+def test_solve_puzzle_batch_error_messages():
+    '''
+    Test that a batch formats pre-parsed states as strings in configured
+    messages, and falls back to the error code without an error context.
+    '''
+
+    # Build the error context over the app's error configuration.
+    errors = ErrorContext(GetError(ErrorConfigurationRepository('app/configs/error.yml')))
+
+    # Execute a batch with an unsolvable pre-parsed job.
+    results = DomainEvent.handle(
+        SolvePuzzleBatch,
+        dependencies=dict(errors=errors),
+        jobs=[
+            dict(start=(2, 1, 3, 4, 5, 6, 7, 8, 0), goal=GOAL_STRING),
+        ],
+    )
+
+    # Verify the configured message, with the states formatted as strings.
+    assert results[0]['error'] == f'The puzzle configuration is unsolvable: {UNSOLVABLE_START} to {GOAL_STRING}'
+
+    # Execute the same job without an error context.
+    results = DomainEvent.handle(
+        SolvePuzzleBatch,
+        jobs=[
+            dict(start=(2, 1, 3, 4, 5, 6, 7, 8, 0), goal=GOAL_STRING),
+        ],
+    )
+
+    # Verify the error code stands in for the message.
+    assert results[0]['error_code'] == 'UNSOLVABLE_STATE'
+    assert results[0]['error'] == 'UNSOLVABLE_STATE'
+
+
+# ** test: test_solve_puzzle_batch_unexpected_error
+def test_solve_puzzle_batch_unexpected_error():
+    '''
+    Test that an unexpected (non-Tiferet) exception in a job propagates
+    instead of being recorded as a failed job.
+    '''
+
+    # Execute a batch with a malformed job (no start) and expect the
+    # TypeError to propagate.
+    with pytest.raises(TypeError):
+        DomainEvent.handle(
+            SolvePuzzleBatch,
+            jobs=[
+                dict(goal=GOAL_STRING),
+            ],
+        )
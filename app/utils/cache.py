@@ -0,0 +1,43 @@
+# *** imports
+
+# ** core
+from functools import lru_cache, wraps
+from typing import Any, Callable
+
+
+# *** constants
+
+# ** constant: goal_cache_size
+# The most goals each per-goal cache keeps; the least recently used goal is
+# evicted first.
+GOAL_CACHE_SIZE = 32
+
+
+# *** utils
+
+# ** util: goal_cache
+def goal_cache(builder: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    '''
+    Wrap a per-goal builder in a bounded LRU cache (GOAL_CACHE_SIZE goals).
+    The goal is keyed as given when it is a string, and as a tuple
+    otherwise, so list and tuple goals share one entry.
+
+    :param builder: The builder, taking the goal as a string or tuple.
+    :type builder: Callable[[Any], Any]
+    :return: The cached builder, with lru_cache's cache_clear and cache_info.
+    :rtype: Callable[[Any], Any]
+    '''
+
+    # Cache the builder by its goal key.
+    cached_builder = lru_cache(maxsize=GOAL_CACHE_SIZE)(builder)
+
+    # Normalize the goal to a hashable key before the lookup; tuple() returns
+    # a tuple goal unchanged.
+    @wraps(builder)
+    def get(goal):
+        return cached_builder(goal if isinstance(goal, str) else tuple(goal))
+
+    # Expose the cache controls and return.
+    get.cache_clear = cached_builder.cache_clear
+    get.cache_info = cached_builder.cache_info
+    return get
@@ -1,12 +1,31 @@
 # *** imports
 
 # ** core
-from typing import List
+from typing import List, Tuple
 
 # ** app
+from .cache import goal_cache
 from .pdb import PatternDatabase
 
 
+# *** constants
+
+# ** constant: md_idx
+MD_IDX: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(abs(i // 3 - j // 3) + abs(i % 3 - j % 3) for j in range(9))
+    for i in range(9)
+)
+
+
+# *** classes
+
+# ** class: last_linear_conflict_goal
+# The goal object and tables of the most recent linear_conflict_code call,
+# checked by identity before hashing the goal (search reuses one goal tuple).
+_LAST_LC_GOAL: Tuple[int, ...] | None = None
+_LAST_LC_TABLES: Tuple[List[List[int]], List[List[int]]] | None = None
+
+
 # *** utils
 
 # ** util: heuristic_calculator
@@ -16,8 +35,8 @@ class HeuristicCalculator:
     Provides static methods for four heuristics: misplaced tiles,
     Manhattan distance, linear conflict (Manhattan + reversed-pair
     penalty), and additive pattern database lookup. All methods accept
-    (state, goal) as flat integer lists and return an integer cost
-    estimate.
+    (state, goal) as flat integer sequences (lists or tuples) and return
+    an integer cost estimate; per-goal lookup tables are cached.
     '''
 
     # * method: misplaced (static)
@@ -40,6 +59,52 @@ class HeuristicCalculator:
             if state[i] != 0 and state[i] != goal[i]
         )
 
+    # * method: goal_positions (static)
+    @staticmethod
+    @goal_cache
+    def goal_positions(goal: List[int]) -> List[int]:
+        '''
+        Get (or lazily compute) the goal index of each tile for a goal
+        state, as a list indexed by tile value.
+
+        :param goal: The goal state as a flat list of 9 ints.
+        :type goal: List[int]
+        :return: A list where positions[tile] is the tile's goal index.
+        :rtype: List[int]
+        '''
+
+        # Record the index of each tile in the goal.
+        positions = [0] * 9
+        for i, tile in enumerate(goal):
+            positions[tile] = i
+
+        # Return the positions.
+        return positions
+
+    # * method: misplaced_table (static)
+    @staticmethod
+    @goal_cache
+    def misplaced_table(goal: List[int]) -> List[List[int]]:
+        '''
+        Get (or lazily compute) the misplaced-tiles table for a goal state,
+        where table[tile][i] is 1 if tile does not belong at position i.
+        The blank row is all zeros.
+
+        :param goal: The goal state as a flat list of 9 ints.
+        :type goal: List[int]
+        :return: A 9x9 table of per-(tile, position) misplaced costs.
+        :rtype: List[List[int]]
+        '''
+
+        # Mark every position except the goal position of each non-blank tile.
+        table = [
+            [0 if tile == 0 or goal[i] == tile else 1 for i in range(9)]
+            for tile in range(9)
+        ]
+
+        # Return the table.
+        return table
+
     # * method: manhattan (static)
     @staticmethod
     def manhattan(state: List[int], goal: List[int]) -> int:
@@ -56,22 +121,35 @@ class HeuristicCalculator:
         :rtype: int
         '''
 
-        # Build a lookup from tile value to goal index.
-        goal_index = {goal[i]: i for i in range(9)}
+        # Look up the per-(tile, position) distance table for this goal.
+        table = HeuristicCalculator.manhattan_table(goal)
 
-        # Sum the Manhattan distances for each non-blank tile.
-        distance = 0
-        for i in range(9):
-            tile = state[i]
-            if tile == 0:
-                continue
-            goal_pos = goal_index[tile]
-            current_row, current_col = i // 3, i % 3
-            goal_row, goal_col = goal_pos // 3, goal_pos % 3
-            distance += abs(current_row - goal_row) + abs(current_col - goal_col)
+        # Sum the table entries for each tile at its current position.
+        return sum(table[state[i]][i] for i in range(9))
 
-        # Return the total distance.
-        return distance
+    # * method: manhattan_table (static)
+    @staticmethod
+    @goal_cache
+    def manhattan_table(goal: List[int]) -> List[List[int]]:
+        '''
+        Get (or lazily compute) the Manhattan distance table for a goal
+        state, where table[tile][i] is the distance of tile from its goal
+        position when placed at position i. The blank row is all zeros.
+
+        :param goal: The goal state as a flat list of 9 ints.
+        :type goal: List[int]
+        :return: A 9x9 table of per-(tile, position) Manhattan distances.
+        :rtype: List[List[int]]
+        '''
+
+        # Copy each non-blank tile's row from the index distance table.
+        table = [[0] * 9 for _ in range(9)]
+        for goal_pos, tile in enumerate(goal):
+            if tile != 0:
+                table[tile] = list(MD_IDX[goal_pos])
+
+        # Return the table.
+        return table
 
     # * method: linear_conflict (static)
     @staticmethod
@@ -93,55 +171,140 @@ class HeuristicCalculator:
         # Start with the Manhattan distance.
         manhattan = HeuristicCalculator.manhattan(state, goal)
 
-        # Build a lookup from tile value to goal index.
-        goal_index = {goal[i]: i for i in range(9)}
+        # Look up the cached goal index of each tile.
+        goal_index = HeuristicCalculator.goal_positions(goal)
 
         # Count linear conflicts.
         conflict = 0
 
         # Check rows for conflicts.
         for row in range(3):
-            tiles_in_row = []
+            goal_cols = []
             for col in range(3):
                 tile = state[row * 3 + col]
                 if tile != 0:
                     g_pos = goal_index[tile]
-                    g_row = g_pos // 3
-                    g_col = g_pos % 3
-                    if g_row == row:
-                        tiles_in_row.append((col, g_col))
+                    if g_pos // 3 == row:
+                        goal_cols.append(g_pos % 3)
 
             # Detect reversed pairs (current col order vs goal col order).
-            for i in range(len(tiles_in_row)):
-                for j in range(i + 1, len(tiles_in_row)):
-                    _, goal_col_i = tiles_in_row[i]
-                    _, goal_col_j = tiles_in_row[j]
-                    if goal_col_i > goal_col_j:
+            for i in range(len(goal_cols)):
+                for j in range(i + 1, len(goal_cols)):
+                    if goal_cols[i] > goal_cols[j]:
                         conflict += 2
 
         # Check columns for conflicts.
         for col in range(3):
-            tiles_in_col = []
+            goal_rows = []
             for row in range(3):
                 tile = state[row * 3 + col]
                 if tile != 0:
                     g_pos = goal_index[tile]
-                    g_row = g_pos // 3
-                    g_col = g_pos % 3
-                    if g_col == col:
-                        tiles_in_col.append((row, g_row))
+                    if g_pos % 3 == col:
+                        goal_rows.append(g_pos // 3)
 
             # Detect reversed pairs (current row order vs goal row order).
-            for i in range(len(tiles_in_col)):
-                for j in range(i + 1, len(tiles_in_col)):
-                    _, goal_row_i = tiles_in_col[i]
-                    _, goal_row_j = tiles_in_col[j]
-                    if goal_row_i > goal_row_j:
+            for i in range(len(goal_rows)):
+                for j in range(i + 1, len(goal_rows)):
+                    if goal_rows[i] > goal_rows[j]:
                         conflict += 2
 
         # Return Manhattan plus conflict penalty.
         return manhattan + conflict
 
+    # * method: linear_conflict_tables (static)
+    @staticmethod
+    @goal_cache
+    def linear_conflict_tables(goal: List[int]) -> Tuple[List[List[int]], List[List[int]]]:
+        '''
+        Get (or lazily compute) the linear conflict triplet tables for a goal
+        state. rows[r][t0 | t1 << 4 | t2 << 8] is the Manhattan distance of
+        tiles t0, t1, t2 placed left to right in row r, plus 2 per reversed
+        pair among those whose goal is in row r; cols[c] holds the conflict
+        penalty alone for tiles t0, t1, t2 placed top to bottom in column c.
+        Summing the three row and three column entries of a state gives its
+        linear conflict value.
+
+        :param goal: The goal state as a flat list of 9 ints.
+        :type goal: List[int]
+        :return: A tuple of (rows, cols), each three 4096-entry tables indexed by a 12-bit tile triplet.
+        :rtype: Tuple[List[List[int]], List[List[int]]]
+        '''
+
+        # Look up the per-tile distances and goal indices.
+        distances = HeuristicCalculator.manhattan_table(goal)
+        goal_index = HeuristicCalculator.goal_positions(goal)
+
+        # Fill an entry for every triplet of tile values in each line.
+        rows = [[0] * 4096 for _ in range(3)]
+        cols = [[0] * 4096 for _ in range(3)]
+        for line in range(3):
+            for t0 in range(9):
+                for t1 in range(9):
+                    for t2 in range(9):
+                        triplet = (t0, t1, t2)
+                        index = t0 | t1 << 4 | t2 << 8
+
+                        # Collect the goal columns of the tiles whose goal is
+                        # in this row, and the goal rows of the tiles whose
+                        # goal is in this column, in line order.
+                        goal_cols = [goal_index[t] % 3 for t in triplet if t != 0 and goal_index[t] // 3 == line]
+                        goal_rows = [goal_index[t] // 3 for t in triplet if t != 0 and goal_index[t] % 3 == line]
+
+                        # Count 2 per reversed pair in each line.
+                        row_conflict = sum(2 for i in range(len(goal_cols)) for j in range(i + 1, len(goal_cols)) if goal_cols[i] > goal_cols[j])
+                        col_conflict = sum(2 for i in range(len(goal_rows)) for j in range(i + 1, len(goal_rows)) if goal_rows[i] > goal_rows[j])
+
+                        # Fold the row's Manhattan distances into the row entry.
+                        rows[line][index] = sum(distances[t][line * 3 + k] for k, t in enumerate(triplet)) + row_conflict
+                        cols[line][index] = col_conflict
+
+        # Return the row and column tables.
+        return rows, cols
+
+    # * method: linear_conflict_code (static)
+    @staticmethod
+    def linear_conflict_code(code: int, goal: List[int]) -> int:
+        '''
+        Calculate Manhattan distance plus linear conflict penalty for a packed
+        state code, as six triplet table lookups (see linear_conflict_tables)
+        instead of a per-tile scan.
+
+        :param code: The current state as a packed state code.
+        :type code: int
+        :param goal: The goal state as a flat list of 9 ints.
+        :type goal: List[int]
+        :return: Manhattan distance plus linear conflict penalty.
+        :rtype: int
+        '''
+
+        global _LAST_LC_GOAL, _LAST_LC_TABLES
+
+        # Reuse the last tables when handed the same goal tuple again,
+        # skipping the tuple conversion and cache probe.
+        if goal is _LAST_LC_GOAL:
+            rows, cols = _LAST_LC_TABLES
+
+        # Otherwise look up the cached triplet tables for this goal, and
+        # remember them only for a tuple goal, since a list could be mutated
+        # in place.
+        else:
+            rows, cols = HeuristicCalculator.linear_conflict_tables(goal)
+            if type(goal) is tuple:
+                _LAST_LC_GOAL = goal
+                _LAST_LC_TABLES = rows, cols
+
+        # Each row is three contiguous nibbles; each column gathers the
+        # nibbles at positions c, c + 3, and c + 6.
+        return (
+            rows[0][code & 0xFFF]
+            + rows[1][(code >> 12) & 0xFFF]
+            + rows[2][(code >> 24) & 0xFFF]
+            + cols[0][(code & 0xF) | ((code >> 8) & 0xF0) | ((code >> 16) & 0xF00)]
+            + cols[1][((code >> 4) & 0xF) | ((code >> 12) & 0xF0) | ((code >> 20) & 0xF00)]
+            + cols[2][((code >> 8) & 0xF) | ((code >> 16) & 0xF0) | ((code >> 24) & 0xF00)]
+        )
+
     # * method: pattern_db (static)
     @staticmethod
     def pattern_db(state: List[int], goal: List[int]) -> int:
@@ -160,3 +323,22 @@ class HeuristicCalculator:
 
         # Delegate to the PatternDatabase utility.
         return PatternDatabase.lookup(state, goal)
+
+    # * method: pattern_db_code (static)
+    @staticmethod
+    def pattern_db_code(code: int, goal: List[int]) -> int:
+        '''
+        Look up the additive pattern database heuristic value for a packed
+        state code. Delegates to PatternDatabase.lookup_code() so search
+        can evaluate the heuristic without decoding the state.
+
+        :param code: The current state as a packed state code.
+        :type code: int
+        :param goal: The goal state as a flat list of 9 ints.
+        :type goal: List[int]
+        :return: The sum of PDB lookups for both patterns.
+        :rtype: int
+        '''
+
+        # Delegate to the PatternDatabase utility.
+        return PatternDatabase.lookup_code(code, goal)
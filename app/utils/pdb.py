@@ -1,10 +1,12 @@
 # *** imports
 
 # ** core
-from collections import deque
-from typing import Dict, List, Tuple
+import os
+import zlib
+from typing import List, Tuple
 
 # ** app
+from .cache import goal_cache
 from .search import ADJACENCY_3X3
 
 
@@ -16,11 +18,47 @@ PDB_TILES_1 = [1, 2, 3, 4]
 # ** constant: pdb_tiles_2
 PDB_TILES_2 = [5, 6, 7, 8]
 
+# ** constant: pdb_size
+# Five base-9 position digits cover every abstract state index.
+PDB_SIZE = 9 ** 5
+
+# ** constant: pdb_unset
+PDB_UNSET = 0xFF
+
+# ** constant: pdb_moves
+# Per blank position, a flat tuple of (neighbor_pos, step) for each adjacent
+# position, where step = neighbor_pos - blank_pos. Adding step to the blank
+# digit of an index moves the blank; subtracting step times a tile digit's
+# weight moves that tile into the old blank position.
+PDB_MOVES = tuple(
+    tuple((neighbor_pos, neighbor_pos - blank_pos) for neighbor_pos in ADJACENCY_3X3[blank_pos])
+    for blank_pos in range(9)
+)
+
+# ** constant: pdb_cache_dir
+PDB_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+    'puzzle',
+)
+
+# ** constant: pdb_cache_magic
+# Leading bytes of a cache file: a tag plus the file format version, bumped
+# whenever the table layout or indexing changes so stale files are rejected.
+PDB_CACHE_VERSION = 1
+PDB_CACHE_MAGIC = b'PDB' + bytes([PDB_CACHE_VERSION])
+
+# ** constant: pdb_cache_header_size
+# The magic, the 9 goal tiles, and a 4-byte CRC-32 of the two tables.
+PDB_CACHE_HEADER_SIZE = len(PDB_CACHE_MAGIC) + 9 + 4
+
 
 # *** classes
 
-# ** class: pdb_cache
-_PDB_CACHE: Dict[Tuple[int, ...], Tuple[dict, dict]] = {}
+# ** class: last_goal
+# The goal object and tables of the most recent get_tables call, checked by
+# identity before hashing the goal (search reuses one goal tuple).
+_LAST_GOAL: Tuple[int, ...] | None = None
+_LAST_TABLES: Tuple[bytearray, bytearray] | None = None
 
 
 # *** utils
@@ -38,32 +76,39 @@ class PatternDatabase:
 
     # * method: abstract_state (static)
     @staticmethod
-    def abstract_state(state, sorted_tiles: List[int]) -> Tuple[int, ...]:
+    def abstract_state(state, sorted_tiles: List[int]) -> int:
         '''
-        Extract an abstract state from a flat puzzle state for PDB lookup.
-        Returns (blank_pos, pos_of_tile_1, pos_of_tile_2, ...).
+        Extract an abstract state from a flat puzzle state for PDB lookup,
+        as a dense base-9 index: the blank position is digit 0 and the
+        position of the i-th pattern tile is digit i.
 
         :param state: The flat puzzle state (list or tuple of 9 ints).
         :type state: list | tuple
         :param sorted_tiles: The pattern tile values in sorted order.
         :type sorted_tiles: List[int]
-        :return: The abstract state tuple.
-        :rtype: Tuple[int, ...]
+        :return: The abstract state index.
+        :rtype: int
         '''
 
-        # Convert to list for index lookup.
-        flat = list(state)
+        # Map each tile to its position in a single pass.
+        pos = [0] * 9
+        for i, tile in enumerate(state):
+            pos[tile] = i
 
-        # Extract blank position and pattern tile positions.
-        blank_pos = flat.index(0)
-        tile_positions = tuple(flat.index(t) for t in sorted_tiles)
+        # Combine the blank position, then each pattern tile position, as
+        # base-9 digits.
+        index = pos[0]
+        weight = 9
+        for tile in sorted_tiles:
+            index += pos[tile] * weight
+            weight *= 9
 
-        # Return the abstract state.
-        return (blank_pos,) + tile_positions
+        # Return the abstract state index.
+        return index
 
     # * method: precompute (static)
     @staticmethod
-    def precompute(tiles: set, goal: Tuple[int, ...]) -> Dict[Tuple[int, ...], int]:
+    def precompute(tiles: set, goal: Tuple[int, ...]) -> bytearray:
         '''
         Precompute a pattern database via 0-1 BFS backward from the goal.
         Moves that displace pattern tiles cost 1; moves over non-pattern
@@ -73,80 +118,239 @@ class PatternDatabase:
         :type tiles: set
         :param goal: The goal state as a flat tuple of 9 ints.
         :type goal: Tuple[int, ...]
-        :return: A mapping from abstract state to exact move cost.
-        :rtype: Dict[Tuple[int, ...], int]
+        :return: A flat table of exact move costs indexed by abstract state index (PDB_UNSET where unreachable).
+        :rtype: bytearray
         '''
 
-        # Build the sorted tile list for consistent key ordering.
+        # Build the sorted tile list for consistent index ordering.
         sorted_tiles = sorted(tiles)
 
         # Compute the goal abstract state.
         goal_abstract = PatternDatabase.abstract_state(goal, sorted_tiles)
 
-        # Initialize the distance table and BFS queue.
-        distances: Dict[Tuple[int, ...], int] = {goal_abstract: 0}
-        queue = deque([(goal_abstract, 0)])
+        # Base-9 digit weights of the pattern tile slots within an index.
+        slot_weights = tuple(9 ** slot for slot in range(1, len(sorted_tiles) + 1))
+
+        # Initialize the flat distance table and the two BFS buckets: states
+        # at the current cost, and states one move further.
+        distances = bytearray([PDB_UNSET]) * PDB_SIZE
+        distances[goal_abstract] = 0
+        bucket = [goal_abstract]
+        next_bucket = []
+        cost = 0
+
+        # 0-1 BFS over cost levels: cost-0 moves stay in the current bucket,
+        # cost-1 moves go to the next one. Order within a level does not
+        # matter, so both buckets are plain lists used as stacks.
+        while bucket:
+            next_cost = cost + 1
+            while bucket:
+                state = bucket.pop()
+
+                # Skip a state that was improved to a lower cost level after
+                # it was queued (it has been expanded at that level).
+                if distances[state] < cost:
+                    continue
+
+                # Split off the blank digit, and map each position held by a
+                # pattern tile to its slot's digit weight (0 for positions
+                # without a pattern tile).
+                rest, blank_pos = divmod(state, 9)
+                weight_of_pos = [0] * 9
+                for weight in slot_weights:
+                    rest, tile_pos = divmod(rest, 9)
+                    weight_of_pos[tile_pos] = weight
+
+                # Explore all adjacent positions for the blank.
+                for neighbor_pos, step in PDB_MOVES[blank_pos]:
+
+                    # Move the blank to the neighbor position.
+                    new_state = state + step
+
+                    # If a pattern tile occupies the neighbor position, move
+                    # it into the old blank position at a cost of 1 and queue
+                    # the result in the next bucket.
+                    weight = weight_of_pos[neighbor_pos]
+                    if weight:
+                        new_state -= step * weight
+                        if next_cost < distances[new_state]:
+                            distances[new_state] = next_cost
+                            next_bucket.append(new_state)
+
+                    # Otherwise the move is free and stays in this bucket
+                    # (unset entries hold PDB_UNSET, above any real cost).
+                    elif cost < distances[new_state]:
+                        distances[new_state] = cost
+                        bucket.append(new_state)
+
+            # Advance to the next cost level.
+            bucket, next_bucket = next_bucket, []
+            cost = next_cost
 
-        # 0-1 BFS: cost-0 moves go to front, cost-1 moves go to back.
-        while queue:
-            state, dist = queue.popleft()
+        # Return the completed distance table.
+        return distances
 
-            # Skip if a shorter path was already found.
-            if distances.get(state, float('inf')) < dist:
-                continue
+    # * method: get_tables (static)
+    @staticmethod
+    def get_tables(goal) -> Tuple[bytearray, bytearray]:
+        '''
+        Get (or lazily compute) PDB tables for a given goal state.
 
-            blank_pos = state[0]
-            tile_positions = list(state[1:])
+        :param goal: The goal state as a flat list/tuple of 9 ints.
+        :type goal: list | tuple
+        :return: A pair of flat PDB tables (pattern1, pattern2).
+        :rtype: Tuple[bytearray, bytearray]
+        '''
 
-            # Explore all adjacent positions for the blank.
-            for neighbor_pos in ADJACENCY_3X3[blank_pos]:
-                new_tile_positions = list(tile_positions)
-                move_cost = 0
+        global _LAST_GOAL, _LAST_TABLES
 
-                # Check if the neighbor position holds a pattern tile.
-                for i, pos in enumerate(tile_positions):
-                    if pos == neighbor_pos:
-                        new_tile_positions[i] = blank_pos
-                        move_cost = 1
-                        break
+        # Return the last tables when handed the same goal tuple again,
+        # skipping the tuple hash and cache probe.
+        if goal is _LAST_GOAL:
+            return _LAST_TABLES
 
-                new_cost = dist + move_cost
-                new_state = (neighbor_pos,) + tuple(new_tile_positions)
+        # Key the cache by tuple; tuple() returns a tuple goal unchanged.
+        goal_tuple = tuple(goal)
+        tables = PatternDatabase.build_tables(goal_tuple)
 
-                # Update if this is a new or shorter path.
-                if new_state not in distances or new_cost < distances[new_state]:
-                    distances[new_state] = new_cost
-                    if move_cost == 0:
-                        queue.appendleft((new_state, new_cost))
-                    else:
-                        queue.append((new_state, new_cost))
+        # Remember the goal for the identity check, unless it is a mutable
+        # list, then return the tables.
+        _LAST_GOAL = goal if goal is goal_tuple else None
+        _LAST_TABLES = tables
+        return tables
 
-        # Return the completed distance table.
-        return distances
+    # * method: build_tables (static)
+    @staticmethod
+    @goal_cache
+    def build_tables(goal: Tuple[int, ...]) -> Tuple[bytearray, bytearray]:
+        '''
+        Load a goal state's PDB tables persisted by an earlier process, or
+        precompute both pattern databases and persist them for the next one.
+        Cached per goal in memory.
 
-    # * method: get_tables (static)
+        :param goal: The goal state as a flat tuple of 9 ints.
+        :type goal: Tuple[int, ...]
+        :return: A pair of flat PDB tables (pattern1, pattern2).
+        :rtype: Tuple[bytearray, bytearray]
+        '''
+
+        # Load the tables from the on-disk cache.
+        tables = PatternDatabase.load_tables(goal)
+
+        # On a disk miss, precompute and persist them.
+        if tables is None:
+            tables = (
+                PatternDatabase.precompute({1, 2, 3, 4}, goal),
+                PatternDatabase.precompute({5, 6, 7, 8}, goal),
+            )
+            PatternDatabase.save_tables(goal, tables)
+
+        # Return the tables.
+        return tables
+
+    # * method: clear_cache (static)
     @staticmethod
-    def get_tables(goal: Tuple[int, ...]) -> Tuple[dict, dict]:
+    def clear_cache() -> None:
         '''
-        Get (or lazily compute) PDB tables for a given goal state.
+        Clear the in-memory PDB caches (the on-disk cache is kept).
+        '''
+
+        global _LAST_GOAL, _LAST_TABLES
+
+        # Drop the per-goal tables and the last-goal shortcut.
+        PatternDatabase.build_tables.cache_clear()
+        _LAST_GOAL = None
+        _LAST_TABLES = None
+
+    # * method: cache_path (static)
+    @staticmethod
+    def cache_path(goal: Tuple[int, ...]) -> str:
+        '''
+        Get the on-disk cache file path for a goal state's PDB tables.
 
         :param goal: The goal state as a flat tuple of 9 ints.
         :type goal: Tuple[int, ...]
-        :return: A pair of PDB lookup dicts (pattern1, pattern2).
-        :rtype: Tuple[dict, dict]
+        :return: The cache file path.
+        :rtype: str
         '''
 
-        # Return cached tables if available.
-        if goal in _PDB_CACHE:
-            return _PDB_CACHE[goal]
+        # Name the file after the goal's tiles in row-major order.
+        return os.path.join(PDB_CACHE_DIR, f'pdb_{"".join(map(str, goal))}.bin')
 
-        # Precompute both pattern databases.
-        pdb1 = PatternDatabase.precompute({1, 2, 3, 4}, goal)
-        pdb2 = PatternDatabase.precompute({5, 6, 7, 8}, goal)
+    # * method: cache_header (static)
+    @staticmethod
+    def cache_header(goal: Tuple[int, ...], body: bytes) -> bytes:
+        '''
+        Build the header of a cache file: the format magic, the goal tiles,
+        and a CRC-32 of the table bytes.
 
-        # Cache and return.
-        _PDB_CACHE[goal] = (pdb1, pdb2)
-        return pdb1, pdb2
+        :param goal: The goal state as a flat tuple of 9 ints.
+        :type goal: Tuple[int, ...]
+        :param body: The two tables, concatenated.
+        :type body: bytes
+        :return: The cache file header.
+        :rtype: bytes
+        '''
+
+        # Combine the magic, goal, and checksum.
+        return PDB_CACHE_MAGIC + bytes(goal) + zlib.crc32(body).to_bytes(4, 'big')
+
+    # * method: load_tables (static)
+    @staticmethod
+    def load_tables(goal: Tuple[int, ...]) -> Tuple[bytearray, bytearray] | None:
+        '''
+        Load a goal state's PDB tables from the on-disk cache.
+
+        :param goal: The goal state as a flat tuple of 9 ints.
+        :type goal: Tuple[int, ...]
+        :return: The pair of PDB tables, or None if missing, unreadable, or invalid.
+        :rtype: Tuple[bytearray, bytearray] | None
+        '''
+
+        # Read the file, treating any I/O failure as a cache miss.
+        try:
+            with open(PatternDatabase.cache_path(goal), 'rb') as cache_file:
+                data = cache_file.read()
+        except OSError:
+            return None
+
+        # Reject truncated or foreign files, files of another format version
+        # or goal, and corrupted tables.
+        if len(data) != PDB_CACHE_HEADER_SIZE + 2 * PDB_SIZE:
+            return None
+        body = data[PDB_CACHE_HEADER_SIZE:]
+        if data[:PDB_CACHE_HEADER_SIZE] != PatternDatabase.cache_header(goal, body):
+            return None
+
+        # Split the body into the two tables.
+        return bytearray(body[:PDB_SIZE]), bytearray(body[PDB_SIZE:])
+
+    # * method: save_tables (static)
+    @staticmethod
+    def save_tables(goal: Tuple[int, ...], tables: Tuple[bytearray, bytearray]) -> None:
+        '''
+        Save a goal state's PDB tables to the on-disk cache. Failures are
+        ignored; the tables are simply recomputed next time.
+
+        :param goal: The goal state as a flat tuple of 9 ints.
+        :type goal: Tuple[int, ...]
+        :param tables: The pair of PDB tables.
+        :type tables: Tuple[bytearray, bytearray]
+        '''
+
+        # Write to a temporary file and rename it into place, so concurrent
+        # readers never see a partial file.
+        path = PatternDatabase.cache_path(goal)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            os.makedirs(PDB_CACHE_DIR, exist_ok=True)
+            with open(temp_path, 'wb') as cache_file:
+                cache_file.write(PatternDatabase.cache_header(goal, tables[0] + tables[1]))
+                cache_file.write(tables[0])
+                cache_file.write(tables[1])
+            os.replace(temp_path, path)
+        except OSError:
+            pass
 
     # * method: lookup (static)
     @staticmethod
@@ -163,16 +367,56 @@ class PatternDatabase:
         '''
 
         # Get the PDB tables for this goal.
-        goal_tuple = tuple(goal)
-        pdb1, pdb2 = PatternDatabase.get_tables(goal_tuple)
-
-        # Look up abstract states for each pattern.
-        abs1 = PatternDatabase.abstract_state(state, PDB_TILES_1)
-        abs2 = PatternDatabase.abstract_state(state, PDB_TILES_2)
+        pdb1, pdb2 = PatternDatabase.get_tables(goal)
+
+        # Map each tile to its position in a single pass, shared by both
+        # patterns.
+        pos = [0] * 9
+        for i, tile in enumerate(state):
+            pos[tile] = i
+
+        # Index both abstract states from the position map.
+        t1, t2, t3, t4 = PDB_TILES_1
+        t5, t6, t7, t8 = PDB_TILES_2
+        blank_pos = pos[0]
+        abs1 = blank_pos + 9 * pos[t1] + 81 * pos[t2] + 729 * pos[t3] + 6561 * pos[t4]
+        abs2 = blank_pos + 9 * pos[t5] + 81 * pos[t6] + 729 * pos[t7] + 6561 * pos[t8]
+
+        # Return the additive heuristic value. Every abstract state of a
+        # valid puzzle state is reachable, so both entries are set.
+        return pdb1[abs1] + pdb2[abs2]
+
+    # * method: lookup_code (static)
+    @staticmethod
+    def lookup_code(code: int, goal) -> int:
+        '''
+        Look up the additive pattern database heuristic value for a packed
+        state code (one 4-bit nibble per position, as produced by
+        AStarSearch.encode), without unpacking it into a list.
 
-        # Sum the costs (0 fallback if abstract state not found).
-        h1 = pdb1.get(abs1, 0)
-        h2 = pdb2.get(abs2, 0)
+        :param code: The current puzzle state as a packed state code.
+        :type code: int
+        :param goal: The goal puzzle state as a flat list/tuple.
+        :type goal: list | tuple
+        :return: The sum of PDB lookups for both disjoint patterns.
+        :rtype: int
+        '''
 
-        # Return the additive heuristic value.
-        return h1 + h2
+        # Get the PDB tables for this goal.
+        pdb1, pdb2 = PatternDatabase.get_tables(goal)
+
+        # Map each tile to its position in a single pass over the nibbles.
+        pos = [0] * 9
+        for i in range(9):
+            pos[(code >> (4 * i)) & 0xF] = i
+
+        # Index both abstract states from the position map.
+        t1, t2, t3, t4 = PDB_TILES_1
+        t5, t6, t7, t8 = PDB_TILES_2
+        blank_pos = pos[0]
+        abs1 = blank_pos + 9 * pos[t1] + 81 * pos[t2] + 729 * pos[t3] + 6561 * pos[t4]
+        abs2 = blank_pos + 9 * pos[t5] + 81 * pos[t6] + 729 * pos[t7] + 6561 * pos[t8]
+
+        # Return the additive heuristic value. Every abstract state of a
+        # valid puzzle state is reachable, so both entries are set.
+        return pdb1[abs1] + pdb2[abs2]
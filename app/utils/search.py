@@ -2,11 +2,22 @@
 
 # ** core
 import heapq
-from typing import Callable, Dict, List, Tuple
+from typing import Callable, List, Tuple
 
 
 # *** constants
 
+# ** constant: inf
+INF = float('inf')
+
+# ** constant: closed
+CLOSED = -1
+
+# ** constant: ida_h_cache_size
+# The most heuristic values ida_search memoizes per search; further states
+# are evaluated on every visit, keeping IDA*'s memory bounded.
+IDA_H_CACHE_SIZE = 1 << 16
+
 # ** constant: adjacency_3x3
 ADJACENCY_3X3 = {
     0: [1, 3], 1: [0, 2, 4], 2: [1, 5],
@@ -14,6 +25,18 @@ ADJACENCY_3X3 = {
     6: [3, 7], 7: [4, 6, 8], 8: [5, 7],
 }
 
+# ** constant: moves_3x3
+# Per blank index, a tuple of (from_idx, from_shift, swap_mask) for each
+# adjacent tile. On a packed state, code ^ (tile * swap_mask) slides the
+# tile at from_idx into the (zero) blank nibble.
+MOVES_3X3 = tuple(
+    tuple(
+        (from_idx, 4 * from_idx, (1 << (4 * blank_idx)) | (1 << (4 * from_idx)))
+        for from_idx in ADJACENCY_3X3[blank_idx]
+    )
+    for blank_idx in range(9)
+)
+
 
 # *** utils
 
@@ -21,17 +44,57 @@ ADJACENCY_3X3 = {
 class AStarSearch:
     '''
     Utility for solving the 8-puzzle via the A* search algorithm.
-    Provides static methods for running A* search, generating
+    Provides static methods for running A* search, packing states
+    into integer codes (one 4-bit nibble per tile), generating
     neighbor states by blank-tile swaps on a 3x3 grid, and
     reconstructing the solution path from a parent map.
     '''
 
+    # * method: encode (static)
+    @staticmethod
+    def encode(state) -> int:
+        '''
+        Pack a flat puzzle state into a single integer, with the tile at
+        position i occupying the 4-bit nibble at bit offset 4 * i.
+
+        :param state: The flat puzzle state (list or tuple of 9 ints).
+        :type state: list | tuple
+        :return: The packed state code.
+        :rtype: int
+        '''
+
+        # Shift each tile into its nibble and combine.
+        code = 0
+        for i, tile in enumerate(state):
+            code |= tile << (4 * i)
+
+        # Return the packed code.
+        return code
+
+    # * method: decode (static)
+    @staticmethod
+    def decode(code: int) -> List[int]:
+        '''
+        Unpack a packed state code into a flat list of 9 tiles.
+
+        :param code: The packed state code.
+        :type code: int
+        :return: The flat puzzle state as a list of 9 ints.
+        :rtype: List[int]
+        '''
+
+        # Extract each 4-bit nibble in position order.
+        return [(code >> (4 * i)) & 0xF for i in range(9)]
+
     # * method: search (static)
     @staticmethod
     def search(
             start: List[int],
             goal: List[int],
             heuristic_fn: Callable[[List[int], List[int]], int],
+            tile_costs: List[List[int]] | None = None,
+            packed_heuristic: bool = False,
+            weight: float = 1.0,
         ) -> Tuple[List[List[int]], int]:
         '''
         Run the A* search algorithm on the 8-puzzle.
@@ -42,97 +105,345 @@ class AStarSearch:
         :type goal: List[int]
         :param heuristic_fn: A heuristic function accepting (state, goal) and returning an int.
         :type heuristic_fn: Callable[[List[int], List[int]], int]
+        :param tile_costs: Optional per-(tile, position) cost table for tile-additive heuristics; when given, h is summed from the table instead of calling heuristic_fn.
+        :type tile_costs: List[List[int]] | None
+        :param packed_heuristic: Whether heuristic_fn accepts the packed state code instead of a decoded list.
+        :type packed_heuristic: bool
+        :param weight: The heuristic weight w in f = g + w * h; 1.0 keeps the solution optimal, w > 1 bounds its cost by w times optimal.
+        :type weight: float
         :return: A tuple of (solution path as list of states, nodes expanded).
         :rtype: Tuple[List[List[int]], int]
         '''
 
-        # Convert states to tuples for hashing.
-        start_tuple = tuple(start)
-        goal_tuple = tuple(goal)
-
-        # Initialize the open set as a priority queue: (f, tie-breaker, state).
-        counter = 0
-        open_set = [(heuristic_fn(start, goal), counter, start_tuple)]
-        heapq.heapify(open_set)
-
-        # Track the best g-score for each state.
-        g_scores = {start_tuple: 0}
-
-        # Track parent states for path reconstruction.
-        parents = {start_tuple: None}
-
-        # Track visited states.
-        closed_set = set()
+        # Pack states into integer codes for hashing.
+        start_code = AStarSearch.encode(start)
+        goal_code = AStarSearch.encode(goal)
+
+        # Hand the goal to the heuristic as a tuple so its per-goal table
+        # caches are hit without re-tupling the goal on every call.
+        goal = tuple(goal)
+
+        # Compute the start heuristic, from the tile cost table when provided.
+        if tile_costs is not None:
+            start_h = AStarSearch.sum_tile_costs(start_code, tile_costs)
+        elif packed_heuristic:
+            start_h = heuristic_fn(start_code, goal)
+        else:
+            start_h = heuristic_fn(start, goal)
+
+        # Assign each discovered state a dense node id; per-node data lives
+        # in lists indexed by id, so only the id lookup hashes the state.
+        node_ids = {start_code: 0}
+        codes = [start_code]
+        parents = [-1]
+        g_scores = [0]
+        h_scores = [start_h]
+
+        # Only scale h (rounded down, which keeps the w-suboptimality bound)
+        # when a weight is set.
+        weighted = weight != 1.0
+
+        # Initialize the open set. Unweighted keys are small integers, so it
+        # is a two-level bucket queue: buckets[f][d] is a stack of entries
+        # (node_id << 4 | blank_idx) with f-score f and heuristic d = f - g.
+        # Popping the lowest f, then the lowest d, breaks equal-f ties toward
+        # the deeper state (nearer the goal); (min_f, min_d) tracks the lowest
+        # possibly non-empty bucket. Weighted keys scale with the weight, so
+        # they use a heap of (f, -g, counter, entry) instead, keeping the
+        # same tie-break with FIFO order for the remaining ties.
+        start_entry = start.index(0)
+        if weighted:
+            counter = 0
+            open_heap = [(int(weight * start_h), 0, 0, start_entry)]
+        else:
+            buckets = [[] for _ in range(start_h)] + [[[] for _ in range(start_h)] + [[start_entry]]]
+            min_f = min_d = start_h
+            num_buckets = len(buckets)
 
         # Count nodes expanded.
         nodes_expanded = 0
 
+        # Bind the hot-loop callables to locals, skipping the module and
+        # attribute lookups on every expansion.
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        get_node_id = node_ids.get
+
         # A* main loop.
-        while open_set:
+        while True:
+
+            # Pop the weighted entry with the lowest key.
+            if weighted:
+                if not open_heap:
+                    break
+                entry = heappop(open_heap)[3]
+
+            # Otherwise advance to the lowest non-empty bucket, moving to the
+            # next f-score once every d bucket of the current one is empty,
+            # and pop its most recent entry.
+            else:
+                if min_f == num_buckets:
+                    break
+                row = buckets[min_f]
+                while min_d < len(row) and not row[min_d]:
+                    min_d += 1
+                if min_d == len(row):
+                    min_f += 1
+                    min_d = 0
+                    continue
+                entry = row[min_d].pop()
 
-            # Pop the state with the lowest f-score.
-            f, _, current = heapq.heappop(open_set)
+            # Unpack the entry.
+            current_id = entry >> 4
+            blank_idx = entry & 0xF
 
-            # Skip if already visited.
-            if current in closed_set:
+            # Skip stale entries left behind when a better g was found
+            # for a state that was still open (it has since been closed).
+            current_g = g_scores[current_id]
+            if current_g == CLOSED:
                 continue
 
-            # Mark the current state as visited.
-            closed_set.add(current)
+            # Mark the current state as visited by tagging its g-score.
+            g_scores[current_id] = CLOSED
+            current = codes[current_id]
             nodes_expanded += 1
 
             # Check if we reached the goal.
-            if current == goal_tuple:
-                path = AStarSearch.reconstruct_path(parents, current)
+            if current == goal_code:
+                path = AStarSearch.reconstruct_path(codes, parents, current_id)
                 return path, nodes_expanded
 
-            # Get the current g-score.
-            current_g = g_scores[current]
-
-            # Generate neighbors by swapping the blank with adjacent tiles.
-            for neighbor in AStarSearch.get_neighbors(current):
-
-                # Skip already visited neighbors.
-                if neighbor in closed_set:
+            # Calculate the tentative g-score shared by every neighbor.
+            tentative_g = current_g + 1
+            current_h = h_scores[current_id]
+
+            # Generate neighbors inline (see get_neighbors) by sliding each
+            # adjacent tile into the blank nibble, avoiding a call and list
+            # allocation per expansion. The blank index travels with the
+            # entry, so no scan is needed.
+            for from_idx, from_shift, swap_mask in MOVES_3X3[blank_idx]:
+                tile = (current >> from_shift) & 0xF
+                neighbor = current ^ (tile * swap_mask)
+
+                # Look up a known neighbor, skipping it unless this path is
+                # better. A closed neighbor's g-score is CLOSED (-1), so the
+                # same compare skips it; with a consistent heuristic a closed
+                # state is never reopened.
+                neighbor_id = get_node_id(neighbor)
+                if neighbor_id is not None:
+                    if tentative_g >= g_scores[neighbor_id]:
+                        continue
+                    g_scores[neighbor_id] = tentative_g
+                    parents[neighbor_id] = current_id
+                    h = h_scores[neighbor_id]
+
+                # Otherwise assign a new node id, computing h once per state:
+                # by the moved tile's cost delta, or in full.
+                else:
+                    if tile_costs is not None:
+                        tile_row = tile_costs[tile]
+                        h = current_h - tile_row[from_idx] + tile_row[blank_idx]
+                    else:
+                        h = heuristic_fn(neighbor if packed_heuristic else AStarSearch.decode(neighbor), goal)
+                    neighbor_id = len(codes)
+                    node_ids[neighbor] = neighbor_id
+                    codes.append(neighbor)
+                    parents.append(current_id)
+                    g_scores.append(tentative_g)
+                    h_scores.append(h)
+
+                # Push a weighted neighbor onto the heap.
+                entry = neighbor_id << 4 | from_idx
+                if weighted:
+                    counter += 1
+                    heappush(open_heap, (tentative_g + int(weight * h), -tentative_g, counter, entry))
                     continue
 
-                # Calculate the tentative g-score.
-                tentative_g = current_g + 1
-
-                # Update if this path is better.
-                if neighbor not in g_scores or tentative_g < g_scores[neighbor]:
-                    g_scores[neighbor] = tentative_g
-                    h = heuristic_fn(list(neighbor), goal)
-                    f = tentative_g + h
-                    counter += 1
-                    heapq.heappush(open_set, (f, counter, neighbor))
-                    parents[neighbor] = current
+                # Otherwise push it onto its bucket, growing the buckets as
+                # needed and lowering the (min_f, min_d) mark if it is lower.
+                f = tentative_g + h
+                if f >= num_buckets:
+                    buckets.extend([] for _ in range(f + 1 - num_buckets))
+                    num_buckets = f + 1
+                row = buckets[f]
+                if h >= len(row):
+                    row.extend([] for _ in range(h + 1 - len(row)))
+                row[h].append(entry)
+                if f < min_f or (f == min_f and h < min_d):
+                    min_f = f
+                    min_d = h
 
         # Should not reach here if solvability was checked.
         return [start], nodes_expanded
 
+    # * method: ida_search (static)
+    @staticmethod
+    def ida_search(
+            start: List[int],
+            goal: List[int],
+            heuristic_fn: Callable[[List[int], List[int]], int],
+            tile_costs: List[List[int]] | None = None,
+            packed_heuristic: bool = False,
+            weight: float = 1.0,
+        ) -> Tuple[List[List[int]], int]:
+        '''
+        Run the iterative deepening A* (IDA*) algorithm on the 8-puzzle.
+        Repeats a depth-first search bounded by f = g + h, raising the bound
+        to the smallest f that exceeded it. No open set, closed set, or
+        g-score map is kept: memory is the current path plus a heuristic
+        memo capped at IDA_H_CACHE_SIZE states.
+
+        :param start: The initial state as a flat list of 9 ints.
+        :type start: List[int]
+        :param goal: The goal state as a flat list of 9 ints.
+        :type goal: List[int]
+        :param heuristic_fn: A heuristic function accepting (state, goal) and returning an int.
+        :type heuristic_fn: Callable[[List[int], List[int]], int]
+        :param tile_costs: Optional per-(tile, position) cost table for tile-additive heuristics; when given, h is updated incrementally instead of calling heuristic_fn.
+        :type tile_costs: List[List[int]] | None
+        :param packed_heuristic: Whether heuristic_fn accepts the packed state code instead of a decoded list.
+        :type packed_heuristic: bool
+        :param weight: The heuristic weight w in f = g + w * h; 1.0 keeps the solution optimal, w > 1 bounds its cost by w times optimal. Large weights let the depth-first dive run far past the optimal depth (and the recursion limit), so prefer search for weighted runs.
+        :type weight: float
+        :return: A tuple of (solution path as list of states, nodes expanded).
+        :rtype: Tuple[List[List[int]], int]
+        '''
+
+        # Pack states into integer codes.
+        start_code = AStarSearch.encode(start)
+        goal_code = AStarSearch.encode(goal)
+
+        # Hand the goal to the heuristic as a tuple (see search).
+        goal = tuple(goal)
+
+        # Compute the start heuristic, from the tile cost table when provided.
+        if tile_costs is not None:
+            start_h = AStarSearch.sum_tile_costs(start_code, tile_costs)
+        elif packed_heuristic:
+            start_h = heuristic_fn(start_code, goal)
+        else:
+            start_h = heuristic_fn(start, goal)
+
+        # Track the current path and the number of nodes expanded.
+        path = [start_code]
+        nodes_expanded = 0
+
+        # Memoize full heuristic evaluations per state for this search, up
+        # to IDA_H_CACHE_SIZE states.
+        h_cache = {start_code: start_h}
+        h_cache_size = IDA_H_CACHE_SIZE
+
+        # Only scale h (rounded down) when a weight is set.
+        weighted = weight != 1.0
+
+        # Bounded depth-first search; returns None when the goal is found,
+        # otherwise the smallest f that exceeded the threshold.
+        def bounded_dfs(code: int, blank_idx: int, g: int, h: int, threshold: int, prev_blank: int) -> int | None:
+            nonlocal nodes_expanded
+
+            # Cut off once f exceeds the threshold.
+            f = g + (int(weight * h) if weighted else h)
+            if f > threshold:
+                return f
+
+            # Count the expansion and check for the goal.
+            nodes_expanded += 1
+            if code == goal_code:
+                return None
+
+            # Expand each move except the one undoing the previous move.
+            next_threshold = INF
+            for from_idx, from_shift, swap_mask in MOVES_3X3[blank_idx]:
+                if from_idx == prev_blank:
+                    continue
+                tile = (code >> from_shift) & 0xF
+                neighbor = code ^ (tile * swap_mask)
+
+                # Update h by the moved tile's cost delta, or evaluate it in
+                # full once per unique state while the memo has room (IDA*
+                # revisits states on every iteration).
+                if tile_costs is not None:
+                    tile_row = tile_costs[tile]
+                    neighbor_h = h - tile_row[from_idx] + tile_row[blank_idx]
+                else:
+                    neighbor_h = h_cache.get(neighbor)
+                    if neighbor_h is None:
+                        neighbor_h = heuristic_fn(neighbor if packed_heuristic else AStarSearch.decode(neighbor), goal)
+                        if len(h_cache) < h_cache_size:
+                            h_cache[neighbor] = neighbor_h
+
+                # Recurse, keeping the neighbor on the path only while it is searched.
+                path.append(neighbor)
+                result = bounded_dfs(neighbor, from_idx, g + 1, neighbor_h, threshold, blank_idx)
+                if result is None:
+                    return None
+                path.pop()
+                if result < next_threshold:
+                    next_threshold = result
+
+            # Return the next threshold candidate.
+            return next_threshold
+
+        # Deepen the f threshold until the goal is found, starting each
+        # iteration from the start's blank (lists and tuples both index).
+        start_blank = start.index(0)
+        threshold = int(weight * start_h)
+        while True:
+            result = bounded_dfs(start_code, start_blank, 0, start_h, threshold, -1)
+
+            # Return the decoded path once the goal is reached.
+            if result is None:
+                return [AStarSearch.decode(code) for code in path], nodes_expanded
+
+            # Should not reach here if solvability was checked.
+            if result == INF:
+                return [start], nodes_expanded
+            threshold = result
+
+    # * method: sum_tile_costs (static)
+    @staticmethod
+    def sum_tile_costs(code: int, tile_costs: List[List[int]]) -> int:
+        '''
+        Sum a per-(tile, position) cost table over a packed state.
+
+        :param code: The packed state code.
+        :type code: int
+        :param tile_costs: A 9x9 table where tile_costs[tile][i] is the cost of tile at position i.
+        :type tile_costs: List[List[int]]
+        :return: The summed heuristic value.
+        :rtype: int
+        '''
+
+        # Index the table by each nibble and its position.
+        return sum(tile_costs[(code >> (4 * i)) & 0xF][i] for i in range(9))
+
     # * method: get_neighbors (static)
     @staticmethod
-    def get_neighbors(state: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+    def get_neighbors(code: int, blank_idx: int | None = None) -> List[Tuple[int, int, int, int]]:
         '''
         Generate all valid neighbor states by swapping the blank tile
         with an adjacent tile on the 3x3 grid.
 
-        :param state: The current state as a tuple of 9 ints.
-        :type state: Tuple[int, ...]
-        :return: A list of neighbor states.
-        :rtype: List[Tuple[int, ...]]
+        :param code: The current state as a packed state code.
+        :type code: int
+        :param blank_idx: The blank tile's index, if already known; scanned from the code otherwise.
+        :type blank_idx: int | None
+        :return: A list of (neighbor code, moved tile, tile's old index, tile's new index) tuples.
+        :rtype: List[Tuple[int, int, int, int]]
         '''
 
-        # Find the position of the blank tile.
-        blank_idx = state.index(0)
+        # Find the position of the blank tile by scanning the nibbles if not given.
+        if blank_idx is None:
+            blank_idx = 0
+            while (code >> (4 * blank_idx)) & 0xF:
+                blank_idx += 1
 
-        # Generate neighbor states using the adjacency map.
+        # Generate neighbor states by moving each adjacent tile into the
+        # blank nibble (the blank nibble is zero, so XOR sets and clears).
         neighbors = []
-        for swap_idx in ADJACENCY_3X3[blank_idx]:
-            new_state = list(state)
-            new_state[blank_idx], new_state[swap_idx] = new_state[swap_idx], new_state[blank_idx]
-            neighbors.append(tuple(new_state))
+        for from_idx, from_shift, swap_mask in MOVES_3X3[blank_idx]:
+            tile = (code >> from_shift) & 0xF
+            neighbors.append((code ^ (tile * swap_mask), tile, from_idx, blank_idx))
 
         # Return the list of neighbors.
         return neighbors
@@ -140,29 +451,36 @@ class AStarSearch:
     # * method: reconstruct_path (static)
     @staticmethod
     def reconstruct_path(
-            parents: Dict[Tuple[int, ...], Tuple[int, ...] | None],
-            current: Tuple[int, ...],
+            codes: List[int],
+            parents: List[int],
+            current: int,
         ) -> List[List[int]]:
         '''
         Reconstruct the solution path from start to goal by tracing
-        the parent map backward from the goal state.
-
-        :param parents: A mapping from each state to its predecessor.
-        :type parents: Dict[Tuple[int, ...], Tuple[int, ...] | None]
-        :param current: The goal state to trace back from.
-        :type current: Tuple[int, ...]
+        parent node ids backward from the goal node.
+
+        :param codes: The packed state code of each node id.
+        :type codes: List[int]
+        :param parents: The parent node id of each node id (-1 for the start).
+        :type parents: List[int]
+        :param current: The goal node id to trace back from.
+        :type current: int
         :return: The solution path as a list of states (start to goal).
         :rtype: List[List[int]]
         '''
 
-        # Build the path by tracing parents from goal to start.
-        path = []
-        while current is not None:
-            path.append(list(current))
+        # Count the path length by walking the parent ids once.
+        length = 0
+        node = current
+        while node != -1:
+            length += 1
+            node = parents[node]
+
+        # Fill a pre-sized path from the end, decoding each state once.
+        path = [None] * length
+        for i in range(length - 1, -1, -1):
+            path[i] = AStarSearch.decode(codes[current])
             current = parents[current]
 
-        # Reverse to get start-to-goal order.
-        path.reverse()
-
-        # Return the path.
+        # Return the start-to-goal path.
         return path
@@ -1,11 +1,20 @@
 # *** imports
 
 # ** core
-from typing import List
+from typing import List, Sequence, Tuple
 
 # ** infra
 from tiferet.events import RaiseError
 
+# ** app
+from .cache import goal_cache
+
+
+# *** constants
+
+# ** constant: all_tiles_mask
+ALL_TILES_MASK = (1 << 9) - 1
+
 
 # *** utils
 
@@ -28,30 +37,47 @@ class PuzzleStateParser:
         :rtype: List[int]
         '''
 
-        # Normalize the blank symbol to 0.
-        normalized = state_str.replace('*', '0')
-
-        # Try splitting on commas first.
-        if ',' in normalized:
-            tokens = [t.strip() for t in normalized.split(',')]
-        # Try splitting on whitespace.
-        elif ' ' in normalized:
-            tokens = normalized.split()
-        # Fall back to character splitting for 9-char contiguous strings.
-        elif len(normalized.strip()) == 9:
-            tokens = list(normalized.strip())
-        else:
-            tokens = normalized.split()
-
-        # Convert tokens to integers.
-        try:
-            return [int(t) for t in tokens]
-        except ValueError:
+        # Walk the string once: each digit is a tile, '*' is the blank, and
+        # commas and whitespace separate tiles. Any other character is invalid,
+        # as is a comma with no tile since the previous comma (an empty token).
+        tiles = []
+        separated = joined = False
+        previous_tile = False
+        comma = False
+        tile_since_comma = False
+        for char in state_str:
+            if '0' <= char <= '9':
+                tiles.append(ord(char) - 48)
+            elif char == '*':
+                tiles.append(0)
+            elif char == ',' and tile_since_comma:
+                separated = comma = True
+                previous_tile = tile_since_comma = False
+                continue
+            elif char.isspace():
+                separated = True
+                previous_tile = False
+                continue
+            else:
+                RaiseError.execute(
+                    error_code='INVALID_STATE',
+                    state=state_str,
+                )
+            joined = joined or previous_tile
+            previous_tile = tile_since_comma = True
+
+        # Adjacent tiles are only allowed in the contiguous (unseparated)
+        # form, so a separated string with a multi-digit token is invalid, and
+        # a trailing comma leaves an empty last token.
+        if (joined and separated) or (comma and not tile_since_comma):
             RaiseError.execute(
                 error_code='INVALID_STATE',
                 state=state_str,
             )
 
+        # Return the parsed tiles.
+        return tiles
+
     # * method: verify_state (static)
     @staticmethod
     def verify_state(state: List[int]) -> None:
@@ -63,13 +89,75 @@ class PuzzleStateParser:
         :type state: List[int]
         '''
 
+        # Set one bit per int tile in range; exactly 9 tiles cover all 9 bits
+        # only if each of 0-8 appears once. Non-int tiles (strings, floats,
+        # bools) set no bit.
+        mask = 0
+        if len(state) == 9:
+            for tile in state:
+                if type(tile) is int and 0 <= tile <= 8:
+                    mask |= 1 << tile
+
         # Verify exactly 9 tiles with values 0-8, each appearing once.
-        if sorted(state) != list(range(9)):
+        if mask != ALL_TILES_MASK:
             RaiseError.execute(
                 error_code='INVALID_STATE',
                 state=str(state),
             )
 
+    # * method: parse_goal (static)
+    @staticmethod
+    def parse_goal(goal: str | Sequence[int]) -> Tuple[int, ...]:
+        '''
+        Parse and verify a goal state, given as a string or as an already
+        parsed sequence of 9 ints (0 = blank), caching the result by string
+        or tuple so repeated solves against the same goal skip both steps.
+
+        :param goal: The goal state as a string, or a pre-parsed sequence of 9 ints.
+        :type goal: str | Sequence[int]
+        :return: The verified goal state as a tuple of 9 integers.
+        :rtype: Tuple[int, ...]
+        '''
+
+        # Reject a goal that is neither a string nor a sequence (e.g. None or
+        # an int) before it is iterated or hashed.
+        if not isinstance(goal, (str, Sequence)):
+            RaiseError.execute(
+                error_code='INVALID_STATE',
+                state=str(goal),
+            )
+
+        # Floats and bools hash like ints, so verify a sequence with a non-int
+        # tile directly (which rejects it) rather than let it hit the cached
+        # entry of an equal int goal.
+        if not isinstance(goal, str) and not all(type(tile) is int for tile in goal):
+            PuzzleStateParser.verify_state(list(goal))
+
+        # Parse and verify the goal, or reuse the cached result.
+        return PuzzleStateParser.build_goal(goal)
+
+    # * method: build_goal (static)
+    @staticmethod
+    @goal_cache
+    def build_goal(goal: str | Tuple[int, ...]) -> Tuple[int, ...]:
+        '''
+        Parse and verify a goal state keyed as a string or tuple, cached per
+        goal (see parse_goal, which screens out non-int tiles first). Failed
+        goals raise and are not cached.
+
+        :param goal: The goal state as a string or a tuple of 9 ints.
+        :type goal: str | Tuple[int, ...]
+        :return: The verified goal state as a tuple of 9 integers.
+        :rtype: Tuple[int, ...]
+        '''
+
+        # Parse a goal string (a tuple is taken as is) and verify the goal.
+        goal_state = PuzzleStateParser.parse_state(goal) if isinstance(goal, str) else list(goal)
+        PuzzleStateParser.verify_state(goal_state)
+
+        # Return the goal as an immutable tuple.
+        return tuple(goal_state)
+
     # * method: is_solvable (static)
     @staticmethod
     def is_solvable(state: List[int], goal: List[int]) -> bool:
@@ -85,14 +173,16 @@ class PuzzleStateParser:
         :rtype: bool
         '''
 
-        # Count inversions for a given state (ignoring blank tile 0).
+        # Count inversions for a given state (ignoring blank tile 0) in one
+        # pass: a bitmask records the tiles seen so far, and each tile adds
+        # the number of larger tiles already seen.
         def count_inversions(s: List[int]) -> int:
             inv = 0
-            tiles = [t for t in s if t != 0]
-            for i in range(len(tiles)):
-                for j in range(i + 1, len(tiles)):
-                    if tiles[i] > tiles[j]:
-                        inv += 1
+            seen = 0
+            for t in s:
+                if t != 0:
+                    inv += (seen >> (t + 1)).bit_count()
+                    seen |= 1 << t
             return inv
 
         # Return True if both states have the same inversion parity.
@@ -112,12 +202,26 @@ class PuzzleStateParser:
         :rtype: str
         '''
 
-        # Replace 0 with the blank symbol and format as 3 rows.
-        display = [blank_symbol if t == 0 else str(t) for t in state]
-        rows = [
-            ' '.join(display[i:i + 3])
-            for i in range(0, 9, 3)
-        ]
+        # Replace 0 with the blank symbol.
+        a, b, c, d, e, f, g, h, i = [blank_symbol if t == 0 else t for t in state]
+
+        # Return the 3 rows as a single template.
+        return f'{a} {b} {c}\n{d} {e} {f}\n{g} {h} {i}'
+
+    # * method: format_state (static)
+    @staticmethod
+    def format_state(state: List[int], blank_symbol: str = '*') -> str:
+        '''
+        Format a flat puzzle state as a comma-separated string, the inverse
+        of parse_state (e.g. for messages about pre-parsed states).
+
+        :param state: The puzzle state as a flat list of 9 integers.
+        :type state: List[int]
+        :param blank_symbol: The symbol to use for the blank tile (0).
+        :type blank_symbol: str
+        :return: The comma-separated state string.
+        :rtype: str
+        '''
 
-        # Return the newline-joined grid.
-        return '\n'.join(rows)
+        # Join the tiles, replacing 0 with the blank symbol.
+        return ','.join(blank_symbol if t == 0 else str(t) for t in state)
@@ -1,9 +1,13 @@
 # *** imports
 
+# ** core
+from itertools import islice, permutations
+
 # ** infra
 import pytest
 
 # ** app
+from app.utils.cache import GOAL_CACHE_SIZE
 from app.utils.heuristic import HeuristicCalculator
 
 
@@ -61,6 +65,35 @@ def test_misplaced_one_move() -> None:
     assert result == 1
 
 
+# ** test: goal_positions
+def test_goal_positions() -> None:
+    '''
+    Test that goal_positions maps each tile to its goal index and accepts tuples.
+    '''
+
+    # Look up positions for the standard goal as a tuple.
+    positions = HeuristicCalculator.goal_positions(tuple(GOAL_STATE))
+
+    # Assert the blank is at 8 and tile 1 at 0.
+    assert positions[0] == 8
+    assert positions[1] == 0
+    assert positions == [GOAL_STATE.index(t) for t in range(9)]
+
+
+# ** test: misplaced_table
+def test_misplaced_table() -> None:
+    '''
+    Test that summing the misplaced table over a state matches misplaced().
+    '''
+
+    # Build the table for the standard goal.
+    table = HeuristicCalculator.misplaced_table(GOAL_STATE)
+
+    # Assert the table sum agrees with the direct count.
+    total = sum(table[SCRAMBLED_STATE[i]][i] for i in range(9))
+    assert total == HeuristicCalculator.misplaced(SCRAMBLED_STATE, GOAL_STATE)
+
+
 # ** test: manhattan_goal
 def test_manhattan_goal() -> None:
     '''
@@ -119,6 +152,46 @@ def test_manhattan_admissible() -> None:
     assert result > 0
 
 
+# ** test: manhattan_table
+def test_manhattan_table() -> None:
+    '''
+    Test the per-(tile, position) Manhattan table for the standard goal.
+    Tile 1 belongs at position 0, so at position 8 it is 4 moves away.
+    '''
+
+    # Build the table for the standard goal.
+    table = HeuristicCalculator.manhattan_table(GOAL_STATE)
+
+    # Assert the blank row is zero and tile distances match the grid.
+    assert table[0] == [0] * 9
+    assert table[1][0] == 0
+    assert table[1][8] == 4
+
+    # Assert the table is cached per goal.
+    assert HeuristicCalculator.manhattan_table(GOAL_STATE) is table
+
+
+# ** test: manhattan_table_cache_bounded
+def test_manhattan_table_cache_bounded() -> None:
+    '''
+    Test that the per-goal table caches keep at most GOAL_CACHE_SIZE goals,
+    evicting the least recently used one.
+    '''
+
+    # Build tables for one more distinct goal than the cache holds.
+    HeuristicCalculator.manhattan_table.cache_clear()
+    goals = list(islice(permutations(range(9)), GOAL_CACHE_SIZE + 1))
+    table = HeuristicCalculator.manhattan_table(goals[0])
+    for goal in goals[1:]:
+        HeuristicCalculator.manhattan_table(goal)
+
+    # Assert the cache is full, and the evicted first goal's table is
+    # rebuilt on its next use.
+    assert HeuristicCalculator.manhattan_table.cache_info().currsize == GOAL_CACHE_SIZE
+    rebuilt = HeuristicCalculator.manhattan_table(list(goals[0]))
+    assert rebuilt == table and rebuilt is not table
+
+
 # ** test: linear_conflict_no_conflict
 def test_linear_conflict_no_conflict() -> None:
     '''
@@ -190,6 +263,51 @@ def test_linear_conflict_admissible() -> None:
     assert lc >= m
 
 
+# ** test: linear_conflict_code_matches_linear_conflict
+def test_linear_conflict_code_matches_linear_conflict() -> None:
+    '''
+    Test that the packed triplet-table linear conflict matches the
+    list-based computation, including for a non-standard goal.
+    '''
+
+    # Pack states into nibbles (tile at position i in bits 4i..4i+3).
+    encode = lambda state: sum(tile << (4 * i) for i, tile in enumerate(state))
+
+    # Compare both computations over conflicting and scrambled states.
+    custom_goal = [1, 2, 3, 8, 0, 4, 7, 6, 5]
+    for state in ([2, 1, 3, 4, 5, 6, 7, 8, 0], SCRAMBLED_STATE, [8, 6, 7, 2, 5, 4, 3, 0, 1], GOAL_STATE):
+        for goal in (GOAL_STATE, custom_goal):
+            expected = HeuristicCalculator.linear_conflict(state, goal)
+            assert HeuristicCalculator.linear_conflict_code(encode(state), goal) == expected
+
+
+# ** test: linear_conflict_code_last_goal
+def test_linear_conflict_code_last_goal() -> None:
+    '''
+    Test that linear_conflict_code resolves the tables once for a repeated
+    goal tuple, and still switches tables when handed a different goal.
+    '''
+
+    # Pack states into nibbles (tile at position i in bits 4i..4i+3).
+    encode = lambda state: sum(tile << (4 * i) for i, tile in enumerate(state))
+
+    # Evaluate two states against one goal tuple.
+    goal = tuple(GOAL_STATE)
+    HeuristicCalculator.linear_conflict_code(encode(SCRAMBLED_STATE), goal)
+    hits = HeuristicCalculator.linear_conflict_tables.cache_info().hits
+    HeuristicCalculator.linear_conflict_code(encode(ONE_MOVE_STATE), goal)
+
+    # Assert the repeated goal skipped the cache probe.
+    assert HeuristicCalculator.linear_conflict_tables.cache_info().hits == hits
+
+    # Assert a different goal (equal as a list) is looked up again and
+    # evaluated against its own tables.
+    custom_goal = (1, 2, 3, 8, 0, 4, 7, 6, 5)
+    expected = HeuristicCalculator.linear_conflict(SCRAMBLED_STATE, list(custom_goal))
+    assert HeuristicCalculator.linear_conflict_code(encode(SCRAMBLED_STATE), custom_goal) == expected
+    assert HeuristicCalculator.linear_conflict_code(encode(SCRAMBLED_STATE), GOAL_STATE) == HeuristicCalculator.linear_conflict(SCRAMBLED_STATE, GOAL_STATE)
+
+
 # ** test: pattern_db_goal
 def test_pattern_db_goal() -> None:
     '''
@@ -4,7 +4,9 @@
 import pytest
 
 # ** app
-from app.utils.pdb import PatternDatabase, PDB_TILES_1, PDB_TILES_2, _PDB_CACHE
+from app.utils import pdb as pdb_module
+from app.utils.pdb import PatternDatabase, PDB_TILES_1, PDB_TILES_2, PDB_UNSET, PDB_CACHE_HEADER_SIZE
+from app.utils.cache import GOAL_CACHE_SIZE
 
 
 # *** constants
@@ -28,8 +30,8 @@ def test_abstract_state() -> None:
     # Extract the abstract state for pattern 1 from the goal.
     result = PatternDatabase.abstract_state(GOAL_STATE, PDB_TILES_1)
 
-    # Assert: (blank_pos=8, tile1_pos=0, tile2_pos=1, tile3_pos=2, tile4_pos=3).
-    assert result == (8, 0, 1, 2, 3)
+    # Assert: blank_pos=8, tile1_pos=0, tile2_pos=1, tile3_pos=2, tile4_pos=3.
+    assert result == 8 + 0 * 9 + 1 * 81 + 2 * 729 + 3 * 6561
 
 
 # ** test: abstract_state_pattern_2
@@ -42,8 +44,8 @@ def test_abstract_state_pattern_2() -> None:
     # Extract the abstract state for pattern 2 from the goal.
     result = PatternDatabase.abstract_state(GOAL_STATE, PDB_TILES_2)
 
-    # Assert: (blank_pos=8, tile5_pos=4, tile6_pos=5, tile7_pos=6, tile8_pos=7).
-    assert result == (8, 4, 5, 6, 7)
+    # Assert: blank_pos=8, tile5_pos=4, tile6_pos=5, tile7_pos=6, tile8_pos=7.
+    assert result == 8 + 4 * 9 + 5 * 81 + 6 * 729 + 7 * 6561
 
 
 # ** test: abstract_state_scrambled
@@ -58,8 +60,8 @@ def test_abstract_state_scrambled() -> None:
     state = [2, 8, 3, 1, 6, 4, 7, 0, 5]
     result = PatternDatabase.abstract_state(state, PDB_TILES_1)
 
-    # Assert: (blank_pos=7, tile1_pos=3, tile2_pos=0, tile3_pos=2, tile4_pos=5).
-    assert result == (7, 3, 0, 2, 5)
+    # Assert: blank_pos=7, tile1_pos=3, tile2_pos=0, tile3_pos=2, tile4_pos=5.
+    assert result == 7 + 3 * 9 + 0 * 81 + 2 * 729 + 5 * 6561
 
 
 # ** test: precompute_goal_entry
@@ -80,33 +82,33 @@ def test_precompute_goal_entry() -> None:
 # ** test: precompute_nonempty
 def test_precompute_nonempty() -> None:
     '''
-    Test that precomputing a PDB produces a non-trivial number of entries.
-    The 4-tile pattern on a 3x3 grid should produce thousands of reachable
+    Test that precomputing a PDB fills an entry for every abstract state.
+    The 4-tile pattern on a 3x3 grid has 9 * P(8,4) = 15120 reachable
     abstract states.
     '''
 
     # Precompute the PDB for pattern {1,2,3,4}.
     distances = PatternDatabase.precompute({1, 2, 3, 4}, GOAL_TUPLE)
 
-    # Assert the table has a substantial number of entries.
-    assert len(distances) > 1000
+    # Assert every reachable abstract state has an entry.
+    assert len(distances) - distances.count(PDB_UNSET) == 15120
 
 
 # ** test: get_tables_returns_pair
 def test_get_tables_returns_pair() -> None:
     '''
-    Test that get_tables returns a pair of non-empty dicts.
+    Test that get_tables returns a pair of non-empty flat tables.
     '''
 
     # Clear cache to ensure fresh computation.
-    _PDB_CACHE.clear()
+    PatternDatabase.clear_cache()
 
     # Get tables for the standard goal.
     pdb1, pdb2 = PatternDatabase.get_tables(GOAL_TUPLE)
 
-    # Assert both are non-empty dicts.
-    assert isinstance(pdb1, dict) and len(pdb1) > 0
-    assert isinstance(pdb2, dict) and len(pdb2) > 0
+    # Assert both are bytearrays with set entries.
+    assert isinstance(pdb1, bytearray) and pdb1.count(PDB_UNSET) < len(pdb1)
+    assert isinstance(pdb2, bytearray) and pdb2.count(PDB_UNSET) < len(pdb2)
 
 
 # ** test: get_tables_caching
@@ -117,7 +119,7 @@ def test_get_tables_caching() -> None:
     '''
 
     # Clear cache to start fresh.
-    _PDB_CACHE.clear()
+    PatternDatabase.clear_cache()
 
     # First call computes the tables.
     result1 = PatternDatabase.get_tables(GOAL_TUPLE)
@@ -129,8 +131,101 @@ def test_get_tables_caching() -> None:
     assert result1[0] is result2[0]
     assert result1[1] is result2[1]
 
-    # Assert the goal is in the cache.
-    assert GOAL_TUPLE in _PDB_CACHE
+    # Assert the goal is in the cache: a list goal, which bypasses the
+    # last-goal shortcut, is a cache hit.
+    hits = PatternDatabase.build_tables.cache_info().hits
+    PatternDatabase.get_tables(GOAL_STATE)
+    assert PatternDatabase.build_tables.cache_info().hits == hits + 1
+
+
+# ** test: get_tables_cache_bounded
+def test_get_tables_cache_bounded() -> None:
+    '''
+    Test that the in-memory PDB cache is bounded to GOAL_CACHE_SIZE goals.
+    '''
+
+    # Assert the per-goal table cache has the shared bound.
+    assert PatternDatabase.build_tables.cache_info().maxsize == GOAL_CACHE_SIZE
+
+
+# ** test: get_tables_last_goal
+def test_get_tables_last_goal() -> None:
+    '''
+    Test that get_tables returns the right tables when alternating goals,
+    including list goals that bypass the last-goal identity check.
+    '''
+
+    # Look up tables for two different goals.
+    other_goal = (1, 2, 3, 8, 0, 4, 7, 6, 5)
+    standard = PatternDatabase.get_tables(GOAL_TUPLE)
+    other = PatternDatabase.get_tables(other_goal)
+
+    # Assert alternating tuple and list goals return matching tables.
+    assert PatternDatabase.get_tables(GOAL_TUPLE) is standard
+    assert PatternDatabase.get_tables(list(other_goal)) is other
+    assert PatternDatabase.get_tables(GOAL_STATE) is standard
+    assert PatternDatabase.get_tables(other_goal) is other
+
+
+# ** test: get_tables_disk_cache
+def test_get_tables_disk_cache(tmp_path) -> None:
+    '''
+    Test that get_tables persists computed tables to disk and that a fresh
+    process (empty in-memory cache) loads them back unchanged.
+    '''
+
+    # Start with an empty in-memory cache (the disk cache is the temporary
+    # directory set by the pdb_cache_dir fixture).
+    assert pdb_module.PDB_CACHE_DIR == str(tmp_path)
+    PatternDatabase.clear_cache()
+
+    # First call computes and persists the tables.
+    computed = PatternDatabase.get_tables(GOAL_TUPLE)
+    assert (tmp_path / 'pdb_123456780.bin').exists()
+
+    # A cleared in-memory cache loads equal tables from disk.
+    PatternDatabase.clear_cache()
+    assert PatternDatabase.load_tables(GOAL_TUPLE) == computed
+    assert PatternDatabase.get_tables(GOAL_TUPLE) == computed
+
+
+# ** test: load_tables_invalid_file
+def test_load_tables_invalid_file(tmp_path) -> None:
+    '''
+    Test that load_tables treats a missing, truncated, headerless, stale, or
+    corrupted file as a cache miss.
+    '''
+
+    # A missing file is a miss.
+    assert PatternDatabase.load_tables(GOAL_TUPLE) is None
+
+    # A truncated file is a miss.
+    path = tmp_path / 'pdb_123456780.bin'
+    path.write_bytes(b'\x00' * 16)
+    assert PatternDatabase.load_tables(GOAL_TUPLE) is None
+
+    # Save valid tables and check they load.
+    tables = (
+        PatternDatabase.precompute(set(PDB_TILES_1), GOAL_TUPLE),
+        PatternDatabase.precompute(set(PDB_TILES_2), GOAL_TUPLE),
+    )
+    PatternDatabase.save_tables(GOAL_TUPLE, tables)
+    data = path.read_bytes()
+    assert PatternDatabase.load_tables(GOAL_TUPLE) == tables
+
+    # Bare tables of the right size without a header are a miss.
+    path.write_bytes(data[PDB_CACHE_HEADER_SIZE:] + bytes(PDB_CACHE_HEADER_SIZE))
+    assert PatternDatabase.load_tables(GOAL_TUPLE) is None
+
+    # A file of another format version is a miss.
+    path.write_bytes(data[:3] + bytes([data[3] + 1]) + data[4:])
+    assert PatternDatabase.load_tables(GOAL_TUPLE) is None
+
+    # A file with a flipped table byte fails the checksum and is a miss.
+    corrupted = bytearray(data)
+    corrupted[-1] ^= 0x01
+    path.write_bytes(bytes(corrupted))
+    assert PatternDatabase.load_tables(GOAL_TUPLE) is None
 
 
 # ** test: lookup_goal
@@ -162,6 +257,20 @@ def test_lookup_nongoal() -> None:
     assert result > 0
 
 
+# ** test: lookup_code_matches_lookup
+def test_lookup_code_matches_lookup() -> None:
+    '''
+    Test that looking up a packed state code matches the list-based lookup.
+    '''
+
+    # Pack a scrambled state into nibbles (tile at position i in bits 4i..4i+3).
+    state = [2, 8, 3, 1, 6, 4, 7, 0, 5]
+    code = sum(tile << (4 * i) for i, tile in enumerate(state))
+
+    # Assert both lookups agree.
+    assert PatternDatabase.lookup_code(code, GOAL_STATE) == PatternDatabase.lookup(state, GOAL_STATE)
+
+
 # ** test: lookup_admissible
 def test_lookup_admissible() -> None:
     '''
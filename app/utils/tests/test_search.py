@@ -4,6 +4,7 @@
 import pytest
 
 # ** app
+from app.utils import search as search_module
 from app.utils.search import AStarSearch, ADJACENCY_3X3
 
 
@@ -28,6 +29,21 @@ def misplaced_heuristic(state, goal):
 
 # *** tests
 
+# ** test: encode_decode_round_trip
+def test_encode_decode_round_trip() -> None:
+    '''
+    Test that packing a state into a code and unpacking it restores the state.
+    '''
+
+    # Pack and unpack a scrambled state.
+    state = [2, 8, 3, 1, 6, 4, 7, 0, 5]
+    code = AStarSearch.encode(state)
+
+    # Assert each tile occupies its own nibble and the round trip is lossless.
+    assert (code >> (4 * 1)) & 0xF == 8
+    assert AStarSearch.decode(code) == state
+
+
 # ** test: get_neighbors_center
 def test_get_neighbors_center() -> None:
     '''
@@ -36,7 +52,7 @@ def test_get_neighbors_center() -> None:
     '''
 
     # Create a state with blank at center (position 4).
-    state = (1, 2, 3, 4, 0, 6, 7, 8, 5)
+    state = AStarSearch.encode((1, 2, 3, 4, 0, 6, 7, 8, 5))
 
     # Generate neighbors.
     neighbors = AStarSearch.get_neighbors(state)
@@ -45,7 +61,7 @@ def test_get_neighbors_center() -> None:
     assert len(neighbors) == 4
 
     # Assert each neighbor has the blank swapped to an adjacent position.
-    blank_positions = {n.index(0) for n in neighbors}
+    blank_positions = {AStarSearch.decode(n[0]).index(0) for n in neighbors}
     assert blank_positions == {1, 3, 5, 7}
 
 
@@ -57,7 +73,7 @@ def test_get_neighbors_corner() -> None:
     '''
 
     # Create a state with blank at top-left corner (position 0).
-    state = (0, 2, 3, 1, 5, 6, 4, 7, 8)
+    state = AStarSearch.encode((0, 2, 3, 1, 5, 6, 4, 7, 8))
 
     # Generate neighbors.
     neighbors = AStarSearch.get_neighbors(state)
@@ -66,9 +82,25 @@ def test_get_neighbors_corner() -> None:
     assert len(neighbors) == 2
 
     # Assert the blank moved to positions 1 and 3.
-    blank_positions = {n.index(0) for n in neighbors}
+    blank_positions = {AStarSearch.decode(n[0]).index(0) for n in neighbors}
     assert blank_positions == {1, 3}
 
+    # Assert each moved tile slid from the new blank position into the old one.
+    assert {(tile, from_idx, to_idx) for _, tile, from_idx, to_idx in neighbors} == {(2, 1, 0), (1, 3, 0)}
+
+
+# ** test: get_neighbors_known_blank
+def test_get_neighbors_known_blank() -> None:
+    '''
+    Test that passing the blank index yields the same neighbors as scanning.
+    '''
+
+    # Create a state with blank at top-center (position 1).
+    state = AStarSearch.encode((2, 0, 3, 1, 5, 6, 4, 7, 8))
+
+    # Assert the known-blank path matches the scanning path.
+    assert AStarSearch.get_neighbors(state, 1) == AStarSearch.get_neighbors(state)
+
 
 # ** test: get_neighbors_edge
 def test_get_neighbors_edge() -> None:
@@ -78,7 +110,7 @@ def test_get_neighbors_edge() -> None:
     '''
 
     # Create a state with blank at top-center (position 1).
-    state = (2, 0, 3, 1, 5, 6, 4, 7, 8)
+    state = AStarSearch.encode((2, 0, 3, 1, 5, 6, 4, 7, 8))
 
     # Generate neighbors.
     neighbors = AStarSearch.get_neighbors(state)
@@ -87,30 +119,31 @@ def test_get_neighbors_edge() -> None:
     assert len(neighbors) == 3
 
     # Assert the blank moved to positions 0, 2, and 4.
-    blank_positions = {n.index(0) for n in neighbors}
+    blank_positions = {AStarSearch.decode(n[0]).index(0) for n in neighbors}
     assert blank_positions == {0, 2, 4}
 
 
 # ** test: reconstruct_path
 def test_reconstruct_path() -> None:
     '''
-    Test path reconstruction from a simple 3-step parent map.
+    Test path reconstruction from a simple 3-step parent id chain.
     '''
 
-    # Build a parent map: A -> B -> C (start -> mid -> goal).
-    state_a = (1, 2, 3, 4, 5, 6, 7, 0, 8)
-    state_b = (1, 2, 3, 4, 5, 6, 0, 7, 8)
-    state_c = (1, 2, 3, 4, 5, 6, 7, 8, 0)
-    parents = {state_a: None, state_b: state_a, state_c: state_b}
+    # Build a parent id chain: A -> B -> C (start -> mid -> goal).
+    state_a = [1, 2, 3, 4, 5, 6, 7, 0, 8]
+    state_b = [1, 2, 3, 4, 5, 6, 0, 7, 8]
+    state_c = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+    codes = [AStarSearch.encode(s) for s in (state_a, state_b, state_c)]
+    parents = [-1, 0, 1]
 
-    # Reconstruct the path from the goal.
-    path = AStarSearch.reconstruct_path(parents, state_c)
+    # Reconstruct the path from the goal (node id 2).
+    path = AStarSearch.reconstruct_path(codes, parents, 2)
 
     # Assert the path is in start-to-goal order.
     assert len(path) == 3
-    assert path[0] == list(state_a)
-    assert path[1] == list(state_b)
-    assert path[2] == list(state_c)
+    assert path[0] == state_a
+    assert path[1] == state_b
+    assert path[2] == state_c
 
 
 # ** test: search_already_solved
@@ -186,3 +219,165 @@ def test_search_known_solution() -> None:
 
     # Assert nodes were expanded.
     assert nodes_expanded >= 1
+
+
+# ** test: search_tile_costs
+def test_search_tile_costs() -> None:
+    '''
+    Test A* search using a per-(tile, position) misplaced-tiles table in
+    place of the heuristic function.
+    '''
+
+    # Build a table costing 1 for each tile away from its goal position.
+    tile_costs = [
+        [0 if tile == 0 or GOAL_STATE[i] == tile else 1 for i in range(9)]
+        for tile in range(9)
+    ]
+
+    # Run search with the table (the heuristic function is not called).
+    start = [1, 2, 3, 0, 5, 6, 4, 7, 8]
+    path, _ = AStarSearch.search(
+        start,
+        GOAL_STATE,
+        lambda state, goal: pytest.fail('heuristic_fn should not be called'),
+        tile_costs,
+    )
+
+    # Assert the solution is optimal (3 moves).
+    assert path[0] == start
+    assert path[-1] == GOAL_STATE
+    assert len(path) - 1 == 3
+
+
+# ** test: search_large_weight
+def test_search_large_weight() -> None:
+    '''
+    Test that weighted A* with a very large weight stays fast and still
+    reaches the goal (weighted keys do not size the open set).
+    '''
+
+    # A 31-move configuration searched with an extreme heuristic weight.
+    start = [8, 6, 7, 2, 5, 4, 3, 0, 1]
+
+    # Run weighted A* search.
+    path, nodes_expanded = AStarSearch.search(
+        start,
+        GOAL_STATE,
+        misplaced_heuristic,
+        weight=1e9,
+    )
+
+    # Assert a valid path to the goal within a small expansion budget.
+    assert path[0] == start
+    assert path[-1] == GOAL_STATE
+    assert all(
+        sum(1 for i in range(9) if a[i] != b[i]) == 2 and a.index(0) in ADJACENCY_3X3[b.index(0)]
+        for a, b in zip(path, path[1:])
+    )
+    assert nodes_expanded < 10000
+
+
+# ** test: search_bucket_tie_break
+def test_search_bucket_tie_break() -> None:
+    '''
+    Test that among open entries with equal f, the one with the lower h
+    (the deeper state) is expanded first.
+    '''
+
+    # Scripted states: the goal is three moves from the start via P and P2;
+    # Q is the start's other neighbor and Y is Q's. With the scripted
+    # heuristic below, the goal (g=3, h=0) and Y (g=2, h=1) both have f=3,
+    # and Y is pushed after the goal, so a plain LIFO pop would take Y.
+    start = [1, 2, 3, 0, 5, 6, 4, 7, 8]
+    p = [1, 2, 3, 4, 5, 6, 0, 7, 8]
+    p2 = [1, 2, 3, 4, 5, 6, 7, 0, 8]
+    scripted_h = {
+        tuple(start): 0,
+        tuple(p): 0,
+        tuple(p2): 0,
+        (0, 2, 3, 1, 5, 6, 4, 7, 8): 1,
+        (2, 0, 3, 1, 5, 6, 4, 7, 8): 1,
+        tuple(GOAL_STATE): 0,
+    }
+
+    # Run A* with the scripted heuristic (all other states are far away).
+    path, nodes_expanded = AStarSearch.search(
+        start,
+        GOAL_STATE,
+        lambda state, goal: scripted_h.get(tuple(state), 100),
+    )
+
+    # Assert the goal was expanded before Y: start, P, P2, Q, goal.
+    assert path == [start, p, p2, GOAL_STATE]
+    assert nodes_expanded == 5
+
+
+# ** test: ida_search_already_solved
+def test_ida_search_already_solved() -> None:
+    '''
+    Test IDA* search when start equals goal (zero moves).
+    '''
+
+    # Run search with start == goal.
+    path, nodes_expanded = AStarSearch.ida_search(
+        GOAL_STATE,
+        GOAL_STATE,
+        misplaced_heuristic,
+    )
+
+    # Assert the path contains only the goal state and one node was expanded.
+    assert path == [GOAL_STATE]
+    assert nodes_expanded == 1
+
+
+# ** test: ida_search_known_solution
+def test_ida_search_known_solution() -> None:
+    '''
+    Test that IDA* finds the same optimal 3-move solution as A*.
+    '''
+
+    # Start: a configuration that requires 3 moves to solve.
+    start = [1, 2, 3, 0, 5, 6, 4, 7, 8]
+
+    # Run IDA* search.
+    path, _ = AStarSearch.ida_search(
+        start,
+        GOAL_STATE,
+        misplaced_heuristic,
+    )
+
+    # Assert the path is optimal and matches A*'s length.
+    assert path[0] == start
+    assert path[-1] == GOAL_STATE
+    assert len(path) - 1 == 3
+    assert len(path) == len(AStarSearch.search(start, GOAL_STATE, misplaced_heuristic)[0])
+
+
+# ** test: ida_search_h_cache_cap
+def test_ida_search_h_cache_cap(monkeypatch) -> None:
+    '''
+    Test that IDA* stops memoizing heuristic values at IDA_H_CACHE_SIZE and
+    still finds the optimal solution.
+    '''
+
+    # Count heuristic evaluations.
+    calls = []
+    def counting_heuristic(state, goal):
+        calls.append(1)
+        return misplaced_heuristic(state, goal)
+
+    # Solve an 18-move start (several deepening iterations) with the memo
+    # enabled.
+    start = [6, 1, 8, 4, 0, 2, 7, 3, 5]
+    path, _ = AStarSearch.ida_search(start, GOAL_STATE, counting_heuristic)
+    memoized_calls = len(calls)
+
+    # Solve it again with no room in the memo.
+    calls.clear()
+    monkeypatch.setattr(search_module, 'IDA_H_CACHE_SIZE', 0)
+    capped_path, _ = AStarSearch.ida_search(start, GOAL_STATE, counting_heuristic)
+
+    # Assert the same optimal path, with states re-evaluated on revisits.
+    assert capped_path == path
+    assert len(path) - 1 == 18
+    assert len(calls) > memoized_calls
@@ -1,10 +1,14 @@
 # *** imports
 
+# ** core
+from itertools import islice, permutations
+
 # ** infra
 import pytest
 
 # ** app
 from tiferet import TiferetError
+from app.utils.cache import GOAL_CACHE_SIZE
 from app.utils.state import PuzzleStateParser
 
 
@@ -105,6 +109,123 @@ def test_parse_state_invalid() -> None:
     assert exc_info.value.error_code == 'INVALID_STATE'
 
 
+# ** test: parse_state_mixed_separators
+def test_parse_state_mixed_separators() -> None:
+    '''
+    Test parsing a state string mixing commas and whitespace.
+    '''
+
+    # Parse a state string with mixed separators.
+    result = PuzzleStateParser.parse_state(' 1, 2 3,4\t5 6 7 8 * ')
+
+    # Assert the parsed result matches expected output.
+    assert result == [1, 2, 3, 4, 5, 6, 7, 8, 0]
+
+
+# ** test: parse_state_multi_digit_token
+def test_parse_state_multi_digit_token() -> None:
+    '''
+    Test that a multi-digit token in a separated string raises INVALID_STATE.
+    '''
+
+    # Attempt to parse a separated state string with a joined token.
+    with pytest.raises(TiferetError) as exc_info:
+        PuzzleStateParser.parse_state('12,3,4,5,6,7,8,*')
+
+    # Assert the error code is INVALID_STATE.
+    assert exc_info.value.error_code == 'INVALID_STATE'
+
+
+# ** test: parse_state_empty_token
+def test_parse_state_empty_token() -> None:
+    '''
+    Test that an empty comma-separated token raises INVALID_STATE.
+    '''
+
+    # Attempt to parse strings with a doubled, leading, trailing, or
+    # blank-only comma token.
+    for state_str in (
+        '1,,2,3,4,5,6,7,8',
+        ',1,2,3,4,5,6,7,8,*',
+        '1,2,3,4,5,6,7,8,*,',
+        '1,2,3,4, ,5,6,7,8,*',
+    ):
+        with pytest.raises(TiferetError) as exc_info:
+            PuzzleStateParser.parse_state(state_str)
+
+        # Assert the error code is INVALID_STATE.
+        assert exc_info.value.error_code == 'INVALID_STATE'
+
+
+# ** test: parse_goal_cached
+def test_parse_goal_cached() -> None:
+    '''
+    Test that parse_goal returns a verified tuple and reuses it for the same string.
+    '''
+
+    # Parse the same goal string twice.
+    first = PuzzleStateParser.parse_goal('1,2,3,4,5,6,7,8,*')
+    second = PuzzleStateParser.parse_goal('1,2,3,4,5,6,7,8,*')
+
+    # Assert the parsed goal is cached and correct.
+    assert first == (1, 2, 3, 4, 5, 6, 7, 8, 0)
+    assert second is first
+
+
+# ** test: parse_goal_cache_bounded
+def test_parse_goal_cache_bounded() -> None:
+    '''
+    Test that parse_goal keeps at most GOAL_CACHE_SIZE goals, evicting the
+    least recently used one.
+    '''
+
+    # Parse one more distinct goal than the cache holds.
+    PuzzleStateParser.build_goal.cache_clear()
+    goals = list(islice(permutations(range(9)), GOAL_CACHE_SIZE + 1))
+    first = PuzzleStateParser.parse_goal(goals[0])
+    for goal in goals[1:]:
+        PuzzleStateParser.parse_goal(goal)
+
+    # Assert the cache is full, and the evicted first goal is parsed again
+    # on its next use.
+    assert PuzzleStateParser.build_goal.cache_info().currsize == GOAL_CACHE_SIZE
+    again = PuzzleStateParser.parse_goal(goals[0])
+    assert again == first and again is not first
+
+
+# ** test: parse_goal_invalid
+def test_parse_goal_invalid() -> None:
+    '''
+    Test that parse_goal raises INVALID_STATE for an invalid goal.
+    '''
+
+    # Assert a duplicate tile is rejected.
+    with pytest.raises(TiferetError) as exc_info:
+        PuzzleStateParser.parse_goal('1,1,3,4,5,6,7,8,*')
+    assert exc_info.value.error_code == 'INVALID_STATE'
+
+
+# ** test: parse_goal_sequence
+def test_parse_goal_sequence() -> None:
+    '''
+    Test that parse_goal accepts a pre-parsed goal sequence, caches it, and
+    still verifies it.
+    '''
+
+    # Parse the same goal as a list and as a tuple.
+    first = PuzzleStateParser.parse_goal([1, 2, 3, 8, 0, 4, 7, 6, 5])
+    second = PuzzleStateParser.parse_goal((1, 2, 3, 8, 0, 4, 7, 6, 5))
+
+    # Assert the goal is returned as the same cached tuple.
+    assert first == (1, 2, 3, 8, 0, 4, 7, 6, 5)
+    assert second is first
+
+    # Assert an invalid sequence is rejected.
+    with pytest.raises(TiferetError) as exc_info:
+        PuzzleStateParser.parse_goal((1, 2, 3, 4, 5, 6, 7, 8))
+    assert exc_info.value.error_code == 'INVALID_STATE'
+
+
 # ** test: verify_state_valid
 def test_verify_state_valid(goal_state: list) -> None:
     '''
@@ -146,6 +267,63 @@ def test_verify_state_duplicate_tile() -> None:
     assert exc_info.value.error_code == 'INVALID_STATE'
 
 
+# ** test: verify_state_non_int_tile
+def test_verify_state_non_int_tile() -> None:
+    '''
+    Test that a state with string, float, or bool tiles raises INVALID_STATE.
+    '''
+
+    # Attempt to verify states whose tiles are not all ints.
+    for state in (
+        ['1', '2', '3', '4', '5', '6', '7', '8', '0'],
+        [1.0, 2, 3, 4, 5, 6, 7, 8, 0],
+        [True, 2, 3, 4, 5, 6, 7, 8, 0],
+    ):
+        with pytest.raises(TiferetError) as exc_info:
+            PuzzleStateParser.verify_state(state)
+
+        # Assert the error code is INVALID_STATE.
+        assert exc_info.value.error_code == 'INVALID_STATE'
+
+
+# ** test: parse_goal_non_sequence
+def test_parse_goal_non_sequence() -> None:
+    '''
+    Test that parse_goal raises INVALID_STATE for a goal that is neither a
+    string nor a sequence, or holds unhashable tiles.
+    '''
+
+    # Attempt to parse non-sequence goals and a goal of list tiles.
+    for goal in (None, 5, {1, 2, 3}, [[1], [2], [3], [4], [5], [6], [7], [8], [0]]):
+        with pytest.raises(TiferetError) as exc_info:
+            PuzzleStateParser.parse_goal(goal)
+
+        # Assert the error code is INVALID_STATE.
+        assert exc_info.value.error_code == 'INVALID_STATE'
+
+
+# ** test: parse_goal_non_int_sequence
+def test_parse_goal_non_int_sequence() -> None:
+    '''
+    Test that parse_goal rejects a pre-parsed goal with non-int tiles, even
+    when an equal int goal is already cached.
+    '''
+
+    # Cache the int goal first.
+    PuzzleStateParser.parse_goal((1, 2, 3, 4, 5, 6, 7, 8, 0))
+
+    # Attempt to parse string and float goals.
+    for goal in (
+        ('1', '2', '3', '4', '5', '6', '7', '8', '0'),
+        (1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 0.0),
+    ):
+        with pytest.raises(TiferetError) as exc_info:
+            PuzzleStateParser.parse_goal(goal)
+
+        # Assert the error code is INVALID_STATE.
+        assert exc_info.value.error_code == 'INVALID_STATE'
+
+
 # ** test: is_solvable_true
 def test_is_solvable_true(solvable_state: list, goal_state: list) -> None:
     '''
@@ -1,47 +1,143 @@
 # *** imports
 
+# ** core
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from io import StringIO
+
 # ** infra
 from tiferet import App, TiferetError
 
+# ** app
+from app.utils import State, PDB, Heuristic
+
+
+# *** functions
+
+# ** function: get_app
+@lru_cache(maxsize=None)
+def get_app() -> App:
+    '''
+    Get the app instance of this process, creating it on first use.
+
+    :return: The app instance.
+    :rtype: App
+    '''
+
+    # Create the app instance; the cache returns it on later calls.
+    return App()
+
+
+# ** function: solve_batch
+def solve_batch(jobs: list) -> list:
+    '''
+    Solve a list of jobs in one puzzle.solve_batch feature run. The app
+    instance is created once per process and reused across batches.
+
+    :param jobs: The jobs to solve, each a dict of start, goal, and heuristic.
+    :type jobs: list
+    :return: One result dict per job, in job order.
+    :rtype: list
+    '''
+
+    # Run the batch.
+    return get_app().run(
+        'puzzle_solver',
+        'puzzle.solve_batch',
+        data=dict(jobs=jobs),
+    )
+
 
 # *** main
 
-# Create new app instance.
-app = App()
-
-# Define test cases: (label, start_state, goal_state).
-test_cases = [
-    ('Trivial (solved)',        '1,2,3,4,5,6,7,8,*', '1,2,3,4,5,6,7,8,*'),
-    ('Easy (2 moves)',          '1,2,3,4,5,6,7,*,8', '1,2,3,4,5,6,7,8,*'),
-    ('Easy (3 moves)',          '1,2,3,4,5,6,*,7,8', '1,2,3,4,5,6,7,8,*'),
-    ('Medium (10+ moves)',      '2,8,3,1,6,4,7,*,5', '1,2,3,8,*,4,7,6,5'),
-    ('Medium (custom goal)',    '1,3,4,8,6,2,7,*,5', '1,2,3,8,*,4,7,6,5'),
-    ('Hard (20+ moves)',        '8,6,7,2,5,4,3,*,1', '1,2,3,4,5,6,7,8,*'),
-    ('Hard (scrambled)',        '6,1,8,4,*,2,7,3,5', '1,2,3,4,5,6,7,8,*'),
-    ('Unsolvable',              '1,2,3,4,5,6,8,7,*', '1,2,3,4,5,6,7,8,*'),
-]
-
-# Heuristics to benchmark.
-heuristics = ['misplaced', 'manhattan', 'linear-conflict', 'pattern-db']
-
-# Run each test case with each heuristic.
-for label, start, goal in test_cases:
-    print('=' * 60)
-    print(f'Test: {label}')
-    print(f'Start: {start}')
-    print(f'Goal:  {goal}')
-    print('=' * 60)
-
-    for h in heuristics:
-        try:
-            result = app.run(
-                'puzzle_solver',
-                'puzzle.solve',
-                data=dict(start=start, goal=goal, heuristic=h),
-            )
-            print(result)
-        except TiferetError as e:
-            print(f'[{h}] Error: {e.message}')
-            print()
-
-    print()
+if __name__ == '__main__':
+
+    # Define test cases: (label, start_state, goal_state).
+    test_cases = [
+        ('Trivial (solved)',        '1,2,3,4,5,6,7,8,*', '1,2,3,4,5,6,7,8,*'),
+        ('Easy (2 moves)',          '1,2,3,4,5,6,7,*,8', '1,2,3,4,5,6,7,8,*'),
+        ('Easy (3 moves)',          '1,2,3,4,5,6,*,7,8', '1,2,3,4,5,6,7,8,*'),
+        ('Medium (10+ moves)',      '2,8,3,1,6,4,7,*,5', '1,2,3,8,*,4,7,6,5'),
+        ('Medium (custom goal)',    '1,3,4,8,6,2,7,*,5', '1,2,3,8,*,4,7,6,5'),
+        ('Hard (20+ moves)',        '8,6,7,2,5,4,3,*,1', '1,2,3,4,5,6,7,8,*'),
+        ('Hard (scrambled)',        '6,1,8,4,*,2,7,3,5', '1,2,3,4,5,6,7,8,*'),
+        ('Unsolvable',              '1,2,3,4,5,6,8,7,*', '1,2,3,4,5,6,7,8,*'),
+    ]
+
+    # Heuristics to benchmark.
+    heuristics = ['misplaced', 'manhattan', 'linear-conflict', 'pattern-db']
+
+    # Parse each distinct goal once, and prime its pattern database and
+    # linear conflict tables so building or loading them is not charged to
+    # the first solve's time (forked worker processes inherit them; others
+    # load the pattern database from the disk cache).
+    goal_states = {}
+    for goal in dict.fromkeys(goal for _, _, goal in test_cases):
+        goal_states[goal] = State.parse_goal(goal)
+        PDB.get_tables(goal_states[goal])
+        Heuristic.linear_conflict_tables(goal_states[goal])
+
+    # Parse each start once.
+    start_states = {start: tuple(State.parse_state(start)) for _, start, _ in test_cases}
+
+    # Build one job per (test case, heuristic) pair, passing the pre-parsed
+    # start and goal tuples.
+    jobs = [
+        dict(start=start_states[start], goal=goal_states[goal], heuristic=h)
+        for _, start, goal in test_cases
+        for h in heuristics
+    ]
+
+    # Deal the jobs round-robin into one chunk per worker process (at most
+    # one per CPU), so each worker pays for a single feature dispatch while
+    # a test case's heuristics, and the hard cases, land on different
+    # workers and run concurrently; on a single CPU the whole grid is one
+    # batch run in this process.
+    workers = min(os.cpu_count() or 1, len(jobs))
+    chunks = [jobs[i::workers] for i in range(workers)]
+    try:
+        if workers == 1:
+            results = solve_batch(jobs)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                batches = list(executor.map(solve_batch, chunks))
+
+            # Put the results back in job order: chunk i holds jobs i,
+            # i + workers, i + 2 * workers, and so on.
+            results = [None] * len(jobs)
+            for i, batch in enumerate(batches):
+                results[i::workers] = batch
+    except TiferetError as e:
+        print(f'Error: {e.message}')
+        raise SystemExit(1)
+
+    # Assemble the report of each test case with its per-heuristic results
+    # in a buffer.
+    report = StringIO()
+
+    # Times measured in parallel share the machine with the other workers,
+    # so say so rather than let them read as serial timings.
+    if workers > 1:
+        print(f'Note: times are wall-clock under parallel load ({workers} worker processes).', file=report)
+        print(file=report)
+
+    for i, (label, start, goal) in enumerate(test_cases):
+        print('=' * 60, file=report)
+        print(f'Test: {label}', file=report)
+        print(f'Start: {start}', file=report)
+        print(f'Goal:  {goal}', file=report)
+        print('=' * 60, file=report)
+
+        for h, result in zip(heuristics, results[i * len(heuristics):]):
+            if not result['success']:
+                print(f'[{h}] Error: {result["error"]}', file=report)
+                print(file=report)
+            else:
+                print(result['result'], file=report)
+
+        print(file=report)
+
+    # Write the whole report in a single write.
+    sys.stdout.write(report.getvalue())